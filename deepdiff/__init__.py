@@ -7,7 +7,7 @@ if __name__ == '__main__':
     logging.basicConfig(format='%(asctime)s %(levelname)8s %(message)s')
 
 
-from .diff import DeepDiff
+from .diff import DeepDiff, iter_diff, deep_equal
 from .search import DeepSearch, grep
 from .deephash import DeepHash
 from .delta import Delta
@@ -9,8 +9,9 @@ from deepdiff.helper import (strings, numbers, times, unprocessed, not_hashed, a
                              convert_item_or_items_into_compiled_regexes_else_none,
                              get_id, type_is_subclass_of_type_group, type_in_type_group,
                              number_to_string, datetime_normalize, KEY_TO_VAL_STR, short_repr,
-                             get_truncate_datetime, dict_)
+                             get_truncate_datetime, dict_, TypeDispatchCache, np, np_ndarray)
 from deepdiff.base import Base
+from deepdiff.path import get_path_filter
 logger = logging.getLogger(__name__)
 
 UNPROCESSED_KEY = object()
@@ -22,6 +23,10 @@ INDEX_VS_ATTRIBUTE = ('[%s]', '.%s')
 
 HASH_LOOKUP_ERR_MSG = '{} is not one of the hashed items.'
 
+# The kinds of the dtypes of booleans, signed integers, unsigned integers and floats.
+# The Numpy arrays of these dtypes are hashed from their buffers.
+NUMPY_BUFFER_HASH_KINDS = frozenset('biuf')
+
 
 def sha256hex(obj):
     """Use Sha256 as a cryptographic hash."""
@@ -57,6 +62,35 @@ def combine_hashes_lists(items, prefix):
     return prefix + str(default_hasher(hashes_bytes))
 
 
+class HashesByType(dict):
+    """
+    A dictionary to be used as the hashes of DeepHash when objects that are equal but have different types
+    should not share their hashes. For example 1 and 1.0 are the same key in a normal dictionary.
+    Tuples and frozensets are stored by their ids since (1,) == (1.0,) too.
+    """
+
+    @staticmethod
+    def _get_key(obj):
+        if isinstance(obj, (tuple, frozenset)):
+            return get_id(obj)
+        return (type(obj), obj)
+
+    def __getitem__(self, obj):
+        return super().__getitem__(self._get_key(obj))
+
+    def __setitem__(self, obj, value):
+        super().__setitem__(self._get_key(obj), value)
+
+    def __delitem__(self, obj):
+        super().__delitem__(self._get_key(obj))
+
+    def __contains__(self, obj):
+        return super().__contains__(self._get_key(obj))
+
+    def pop(self, obj, *args):
+        return super().pop(self._get_key(obj), *args)
+
+
 class BoolObj(Enum):
     TRUE = 1
     FALSE = 0
@@ -114,9 +148,95 @@ def prepare_string_for_hashing(
 doc = get_doc('deephash_doc.rst')
 
 
+def _hash_none(self, obj, parent, parents_ids):
+    return 'NONE', 1
+
+
+def _hash_str(self, obj, parent, parents_ids):
+    return prepare_string_for_hashing(
+        obj,
+        ignore_string_type_changes=self.ignore_string_type_changes,
+        ignore_string_case=self.ignore_string_case,
+        encodings=self.encodings,
+        ignore_encoding_errors=self.ignore_encoding_errors,
+    ), 1
+
+
+def _hash_datetime(self, obj, parent, parents_ids):
+    return self._prep_datetime(obj), 1
+
+
+def _hash_number(self, obj, parent, parents_ids):
+    return self._prep_number(obj), 1
+
+
+def _hash_dict(self, obj, parent, parents_ids):
+    return self._prep_dict(obj=obj, parent=parent, parents_ids=parents_ids)
+
+
+def _hash_tuple(self, obj, parent, parents_ids):
+    return self._prep_tuple(obj=obj, parent=parent, parents_ids=parents_ids)
+
+
+def _hash_iterable(self, obj, parent, parents_ids):
+    return self._prep_iterable(obj=obj, parent=parent, parents_ids=parents_ids)
+
+
+def _hash_numpy_array(self, obj, parent, parents_ids):
+    return self._prep_numpy_array(obj=obj, parent=parent, parents_ids=parents_ids)
+
+
+def _hash_bool(self, obj, parent, parents_ids):
+    return 'bool:true' if obj is BoolObj.TRUE else 'bool:false', 1
+
+
+def _hash_other(self, obj, parent, parents_ids):
+    if obj == BoolObj.TRUE or obj == BoolObj.FALSE:
+        return _hash_bool(self, obj, parent, parents_ids)
+    return self._prep_obj(obj=obj, parent=parent, parents_ids=parents_ids)
+
+
+def _find_hash_method(obj):
+    """
+    Find the method to hash objects of the type of obj.
+    All the methods are called with (self, obj, parent, parents_ids) and return the result and the counts.
+    """
+    if obj is None:
+        return _hash_none
+
+    elif isinstance(obj, strings):
+        return _hash_str
+
+    elif isinstance(obj, times):
+        return _hash_datetime
+
+    elif isinstance(obj, numbers):
+        return _hash_number
+
+    elif isinstance(obj, MutableMapping):
+        return _hash_dict
+
+    elif isinstance(obj, tuple):
+        return _hash_tuple
+
+    elif isinstance(obj, np_ndarray):
+        return _hash_numpy_array
+
+    elif isinstance(obj, Iterable):
+        return _hash_iterable
+
+    elif isinstance(obj, BoolObj):
+        return _hash_bool
+
+    return _hash_other
+
+
 class DeepHash(Base):
     __doc__ = doc
 
+    # The hash method of each type of object that is hashed.
+    _hash_methods = TypeDispatchCache(_find_hash_method)
+
     def __init__(self,
                  obj,
                  *,
@@ -124,8 +244,10 @@ class DeepHash(Base):
                  exclude_types=None,
                  exclude_paths=None,
                  exclude_regex_paths=None,
+                 include_paths=None,
                  hasher=None,
                  ignore_repetition=True,
+                 ignore_iterable_order=True,
                  significant_digits=None,
                  truncate_datetime=None,
                  number_format_notation="f",
@@ -146,7 +268,7 @@ class DeepHash(Base):
             raise ValueError(
                 ("The following parameter(s) are not valid: %s\n"
                  "The valid parameters are obj, hashes, exclude_types, significant_digits, truncate_datetime,"
-                 "exclude_paths, exclude_regex_paths, hasher, ignore_repetition, "
+                 "exclude_paths, exclude_regex_paths, include_paths, hasher, ignore_repetition, ignore_iterable_order, "
                  "number_format_notation, apply_hash, ignore_type_in_groups, ignore_string_type_changes, "
                  "ignore_numeric_type_changes, ignore_type_subclasses, ignore_string_case "
                  "number_to_string_func, ignore_private_variables, parent "
@@ -160,8 +282,24 @@ class DeepHash(Base):
         exclude_types = set() if exclude_types is None else set(exclude_types)
         self.exclude_types_tuple = tuple(exclude_types)  # we need tuple for checking isinstance
         self.ignore_repetition = ignore_repetition
+        self.ignore_iterable_order = ignore_iterable_order
         self.exclude_paths = convert_item_or_items_into_set_else_none(exclude_paths)
         self.exclude_regex_paths = convert_item_or_items_into_compiled_regexes_else_none(exclude_regex_paths)
+        self._exclude_paths_filter = get_path_filter(self.exclude_paths)
+        # The states of the exclude_paths filter for the paths that can still lead to an excluded path.
+        self._exclude_path_states = {}
+        if self._exclude_paths_filter is not None:
+            state = self._exclude_paths_filter.get_state(parent)
+            if state is not None:
+                self._exclude_path_states[parent] = state
+        self.include_paths = convert_item_or_items_into_set_else_none(include_paths)
+        self._include_paths_filter = get_path_filter(self.include_paths)
+        # The states of the include_paths filter for the paths that are on the way to an included path or inside one.
+        self._include_path_states = {}
+        if self._include_paths_filter is not None:
+            state = self._include_paths_filter.get_state(parent)
+            if state is not None:
+                self._include_path_states[parent] = state
         self.hasher = default_hasher if hasher is None else hasher
         self.hashes[UNPROCESSED_KEY] = []
 
@@ -186,6 +324,7 @@ class DeepHash(Base):
         self.ignore_private_variables = ignore_private_variables
         self.encodings = encodings
         self.ignore_encoding_errors = ignore_encoding_errors
+        self._hash_methods.refresh()
 
         self._hash(obj, parent=parent, parents_ids=frozenset({get_id(obj)}))
 
@@ -323,9 +462,28 @@ class DeepHash(Base):
         result = "nt{}".format(result) if is_namedtuple else "obj{}".format(result)
         return result, counts
 
+    def _extend_path_states(self, parent, path):
+        """
+        Advance the path filter states of the parent to the path that is one level deeper.
+        """
+        piece = None
+        state = self._exclude_path_states.get(parent)
+        if state is not None:
+            piece = path[len(parent):]
+            state = self._exclude_paths_filter.advance(state, piece)
+            if state is not None:
+                self._exclude_path_states[path] = state
+        state = self._include_path_states.get(parent)
+        if state is not None:
+            state = self._include_paths_filter.advance(state, piece or path[len(parent):])
+            if state is not None:
+                self._include_path_states[path] = state
+
     def _skip_this(self, obj, parent):
         skip = False
-        if self.exclude_paths and parent in self.exclude_paths:
+        if self._exclude_path_states and self._exclude_paths_filter.is_match(self._exclude_path_states.get(parent)):
+            skip = True
+        elif self._include_paths_filter is not None and parent not in self._include_path_states:
             skip = True
         elif self.exclude_regex_paths and any(
                 [exclude_regex_path.search(parent) for exclude_regex_path in self.exclude_regex_paths]):
@@ -349,6 +507,8 @@ class DeepHash(Base):
                 continue
             key_formatted = "'%s'" % key if not print_as_attribute and isinstance(key, strings) else key
             key_in_report = key_text % (parent, key_formatted)
+            if self._exclude_path_states or self._include_path_states:
+                self._extend_path_states(parent, key_in_report)
 
             key_hash, _ = self._hash(key, parent=key_in_report, parents_ids=parents_ids)
             if not key_hash:
@@ -379,9 +539,14 @@ class DeepHash(Base):
 
         counts = 1
         result = defaultdict(int)
+        # Sets have no order to begin with so they are always hashed as if the order is ignored.
+        keep_order = not self.ignore_iterable_order and not isinstance(obj, (set, frozenset))
+        hashes_in_order = []
 
         for i, item in enumerate(obj):
             new_parent = "{}[{}]".format(parent, i)
+            if self._exclude_path_states or self._include_path_states:
+                self._extend_path_states(parent, new_parent)
             if self._skip_this(item, parent=new_parent):
                 continue
 
@@ -394,20 +559,104 @@ class DeepHash(Base):
             # counting repetitions
             result[hashed] += 1
             counts += count
+            if keep_order:
+                hashes_in_order.append(hashed)
 
-        if self.ignore_repetition:
-            result = list(result.keys())
+        if keep_order:
+            result = map(str, hashes_in_order)
         else:
-            result = [
-                '{}|{}'.format(i, v) for i, v in result.items()
-            ]
+            if self.ignore_repetition:
+                result = list(result.keys())
+            else:
+                result = [
+                    '{}|{}'.format(i, v) for i, v in result.items()
+                ]
 
-        result = sorted(map(str, result))  # making sure the result items are string and sorted so join command works.
+            # making sure the result items are string and sorted so join command works.
+            result = sorted(map(str, result))
         result = ','.join(result)
         result = KEY_TO_VAL_STR.format(type(obj).__name__, result)
 
         return result, counts
 
+    def _get_numpy_array_values_to_hash(self, obj):
+        """
+        Get the values of a Numpy array of booleans, integers or floats in the form that their bytes are hashed.
+        The nans are made the same and -0.0 is made 0.0 since they are hashed the same when hashed one by one.
+        The floats are rounded when significant_digits is passed.
+        Returns None if the array has to be hashed item by item.
+        """
+        if any((
+            not self.apply_hash, obj.dtype.kind not in NUMPY_BUFFER_HASH_KINDS, obj.dtype.itemsize > 8,
+            type(obj) is not np_ndarray and not isinstance(obj, np.memmap),
+            self.exclude_paths, self.include_paths, self.exclude_regex_paths, self.exclude_types_tuple,
+            self.exclude_obj_callback, self.ignore_numeric_type_changes,
+        )):
+            return None
+        if obj.dtype.kind != 'f':
+            if self.significant_digits is not None and obj.dtype.kind != 'b':
+                return None
+            return np.ascontiguousarray(obj, dtype=obj.dtype.newbyteorder('='))
+        values = obj.astype(np.float64)
+        if self.significant_digits is not None:
+            formats_numbers_like_python = (
+                self.number_to_string is number_to_string and self.number_format_notation == 'f')
+            if self.significant_digits > 15 or not formats_numbers_like_python:
+                return None
+            # The numbers that are too close to a tie after being scaled could be rounded differently by Python.
+            values *= 10.0 ** self.significant_digits
+            rounded = np.rint(values)
+            with np.errstate(invalid='ignore'):
+                if (np.abs(np.abs(values - rounded) - 0.5) <= np.abs(values) * 2.0 ** -50).any():
+                    return None
+            values = rounded
+        values += 0.0
+        values[np.isnan(values)] = np.nan
+        return values
+
+    def _prep_numpy_array(self, obj, parent, parents_ids=EMPTY_FROZENSET):
+        """
+        Hash the dtype, the shape and the bytes of the values of a Numpy array instead of hashing its items one by one.
+        When the order is ignored, the items along each axis are sorted, from the innermost axis to the outermost one,
+        and the repeated items are dropped unless ignore_repetition is False.
+        So the arrays of the same dtype and the same shape of rows get the same hash when their items would
+        get the same hashes.
+        """
+        values = self._get_numpy_array_values_to_hash(obj)
+        if values is None:
+            return self._prep_iterable(obj=obj, parent=parent, parents_ids=parents_ids)
+
+        counts = 1
+        for length in reversed(obj.shape):
+            counts = 1 + length * counts
+
+        if self.ignore_iterable_order and values.ndim and values.size:
+            # The values are sorted as numbers, which is faster. The sub-arrays of the outer axes
+            # are sorted as void items since they only need to be in the same order when they are the same.
+            items = np.sort(values, axis=-1)
+            items = items.view(np.dtype((np.void, items.dtype.itemsize)))
+            for axis in range(values.ndim - 1, -1, -1):
+                if axis != values.ndim - 1:
+                    items = np.sort(items, axis=-1)
+                if self.ignore_repetition and items.shape[-1] > 1:
+                    repeated = items[..., 1:] == items[..., :-1]
+                    if axis:
+                        # The repeated items are replaced by the last item so the sub-arrays
+                        # with the same unique items end up the same after being sorted again.
+                        items[..., 1:] = np.where(repeated, items[..., -1:], items[..., 1:])
+                        items = np.sort(items, axis=-1)
+                    else:
+                        items = items[np.concatenate([[True], ~repeated])]
+                if axis:
+                    items = np.ascontiguousarray(items)
+                    items = items.view(np.dtype((np.void, items.dtype.itemsize * items.shape[-1])))[..., 0]
+            values = items
+
+        result = sha256('{}:{}:{}:'.format(obj.dtype.type.__name__, obj.ndim, obj.shape[1:]).encode('utf-8'))
+        result.update(np.ascontiguousarray(values))
+        result = KEY_TO_VAL_STR.format(type(obj).__name__, result.hexdigest())
+        return result, counts
+
     def _prep_bool(self, obj):
         return BoolObj.TRUE if obj else BoolObj.FALSE
 
@@ -438,13 +687,8 @@ class DeepHash(Base):
 
     def _hash(self, obj, parent, parents_ids=EMPTY_FROZENSET):
         """The main diff method"""
-        counts = 1
-
         if isinstance(obj, bool):
             obj = self._prep_bool(obj)
-            result = None
-        else:
-            result = not_hashed
         try:
             result, counts = self.hashes[obj]
         except (TypeError, KeyError):
@@ -455,37 +699,8 @@ class DeepHash(Base):
         if self._skip_this(obj, parent):
             return None, 0
 
-        elif obj is None:
-            result = 'NONE'
-
-        elif isinstance(obj, strings):
-            result = prepare_string_for_hashing(
-                obj,
-                ignore_string_type_changes=self.ignore_string_type_changes,
-                ignore_string_case=self.ignore_string_case,
-                encodings=self.encodings,
-                ignore_encoding_errors=self.ignore_encoding_errors,
-            )
-
-        elif isinstance(obj, times):
-            result = self._prep_datetime(obj)
-
-        elif isinstance(obj, numbers):
-            result = self._prep_number(obj)
-
-        elif isinstance(obj, MutableMapping):
-            result, counts = self._prep_dict(obj=obj, parent=parent, parents_ids=parents_ids)
-
-        elif isinstance(obj, tuple):
-            result, counts = self._prep_tuple(obj=obj, parent=parent, parents_ids=parents_ids)
-
-        elif isinstance(obj, Iterable):
-            result, counts = self._prep_iterable(obj=obj, parent=parent, parents_ids=parents_ids)
-
-        elif obj == BoolObj.TRUE or obj == BoolObj.FALSE:
-            result = 'bool:true' if obj is BoolObj.TRUE else 'bool:false'
-        else:
-            result, counts = self._prep_obj(obj=obj, parent=parent, parents_ids=parents_ids)
+        hash_method = self._hash_methods.get(type(obj)) or self._hash_methods.get_handler(obj)
+        result, counts = hash_method(self, obj, parent, parents_ids)
 
         if result is not_hashed:  # pragma: no cover
             self.hashes[UNPROCESSED_KEY].append(obj)
@@ -6,31 +6,33 @@
 # every time you run the docstrings.
 # However the docstring expects it in a specific order in order to pass!
 import difflib
+import heapq
 import logging
 from copy import deepcopy
 from math import isclose as is_close
 from collections.abc import Mapping, Iterable
-from collections import defaultdict
+from collections import defaultdict, deque
 from itertools import zip_longest
 from ordered_set import OrderedSet
 from deepdiff.helper import (strings, bytes_type, numbers, uuids, times, ListItemRemovedOrAdded, notpresent,
-                             IndexedHash, unprocessed, add_to_frozen_set,
+                             IndexedHash, unprocessed,
                              convert_item_or_items_into_set_else_none, get_type,
                              convert_item_or_items_into_compiled_regexes_else_none,
                              type_is_subclass_of_type_group, type_in_type_group, get_doc,
                              number_to_string, datetime_normalize, KEY_TO_VAL_STR, booleans,
                              np_ndarray, get_numpy_ndarray_rows, OrderedSetPlus, RepeatedTimer,
-                             TEXT_VIEW, TREE_VIEW, DELTA_VIEW,
+                             TEXT_VIEW, TREE_VIEW, DELTA_VIEW, TypeDispatchCache,
                              np, get_truncate_datetime, dict_, CannotCompare)
 from deepdiff.serialization import SerializationMixin
-from deepdiff.distance import DistanceMixin
+from deepdiff.distance import DistanceMixin, DiffLengthLimitReached
 from deepdiff.model import (
-    RemapDict, ResultDict, TextResult, TreeResult, DiffLevel,
+    RemapDict, ResultDict, TextResult, TreeResult, DiffLevel, PrettyOrderedSet,
     DictRelationship, AttributeRelationship,
     SubscriptableIterableRelationship, NonSubscriptableIterableRelationship,
-    SetRelationship, NumpyArrayRelationship, CUSTOM_FIELD)
-from deepdiff.deephash import DeepHash, combine_hashes_lists
+    SetRelationship, NumpyArrayRelationship, CUSTOM_FIELD, FORCE_DEFAULT)
+from deepdiff.deephash import DeepHash, combine_hashes_lists, UNPROCESSED_KEY, HashesByType
 from deepdiff.base import Base
+from deepdiff.path import get_path_filter
 from deepdiff.lfucache import LFUCache, DummyLFU
 
 logger = logging.getLogger(__name__)
@@ -72,6 +74,16 @@ INVALID_VIEW_MSG = 'The only valid values for the view parameter are text and tr
 CUTOFF_RANGE_ERROR_MSG = 'cutoff_distance_for_pairs needs to be a positive float max 1.'
 VERBOSE_LEVEL_RANGE_MSG = 'verbose_level should be 0, 1, or 2.'
 PURGE_LEVEL_RANGE_MSG = 'cache_purge_level should be 0, 1, or 2.'
+LSH_BANDS_FOR_PAIRS_MSG = 'lsh_bands_for_pairs should be an integer >= 0.'
+MAX_CANDIDATES_FOR_PAIRS_MSG = 'max_candidates_for_pairs should be None or an integer >= 1.'
+MEMORY_BUDGET_FOR_PAIRS_MSG = 'memory_budget_for_pairs should be an integer >= 1.'
+NUMPY_CHUNK_SIZE_MSG = 'numpy_chunk_size should be an integer >= 1.'
+ITERABLE_KEY_AND_COMPARE_FUNC_MSG = 'iterable_key_func and iterable_compare_func can not be used together.'
+ITERABLE_ALIGNMENTS = {None, 'lcs'}
+INVALID_ITERABLE_ALIGNMENT_MSG = 'The only valid values for iterable_alignment are None and lcs. But {} was passed.'
+ITERABLE_ALIGNMENT_WITH_FUNC_MSG = 'iterable_alignment can not be used with iterable_compare_func or iterable_key_func.'
+INVALID_PARTITION_KEY_FUNC_MSG = 'partition_key_func should be None, type or a function. But {} was passed.'
+ITER_DIFF_VIEW_MSG = 'iter_diff does not take the view parameter since it yields the changes instead of a view.'
 _ENABLE_CACHE_EVERY_X_DIFF = '_ENABLE_CACHE_EVERY_X_DIFF'
 
 # What is the threshold to consider 2 items to be pairs. Only used when ignore_order = True.
@@ -81,10 +93,15 @@ CUTOFF_DISTANCE_FOR_PAIRS_DEFAULT = 0.3
 # For example 2 iterables that have nothing in common, do not need their pairs to be calculated.
 CUTOFF_INTERSECTION_FOR_PAIRS_DEFAULT = 0.7
 
+# How many bytes the Numpy arrays that are used to calculate the distances of numbers can take at a time.
+MEMORY_BUDGET_FOR_PAIRS_DEFAULT = 2 ** 27
+NUMPY_CHUNK_SIZE_DEFAULT = 2 ** 22
+
 DEEPHASH_PARAM_KEYS = (
     'exclude_types',
     'exclude_paths',
     'exclude_regex_paths',
+    'include_paths',
     'hasher',
     'significant_digits',
     'number_format_notation',
@@ -100,9 +117,138 @@ DEEPHASH_PARAM_KEYS = (
 )
 
 
+# The types that Python's == compares the same way DeepDiff does as long as the types of the objects match.
+NATIVE_EQUALITY_LEAF_TYPES = frozenset({str, bytes, int, float, bool, type(None)})
+NATIVE_EQUALITY_CONTAINER_TYPES = frozenset({dict, list, tuple})
+NATIVE_EQUALITY_TYPES = NATIVE_EQUALITY_LEAF_TYPES | NATIVE_EQUALITY_CONTAINER_TYPES
+
+# The types whose objects DeepHash hashes the same when they are equal according to Python's ==,
+# except that booleans are not equal to numbers and all the nans are equal.
+# Bytes are left out since DeepHash decodes them.
+HASHED_BY_VALUE_TYPES = frozenset({str, int, float, bool, type(None)})
+# DeepHash hashes the numbers, booleans and None the same as these strings.
+STRINGS_HASHED_AS_OTHER_TYPES_PREFIXES = ('int:', 'float:', 'bool:', 'NONE')
+# Used in place of the values of nans when the items are hashed by their values.
+_NAN_VALUE = object()
+# The kinds of the numpy dtypes whose items can be compared with Numpy: booleans, integers and floats.
+NUMPY_VECTORIZED_DIFF_KINDS = frozenset('biuf')
+
+
+def _is_natively_equal(t1, t2):
+    """
+    Whether DeepDiff would find no difference between t1 and t2 according to Python's ==.
+    That is only the case when t1 == t2 and all the objects in them are of the builtin types
+    that == compares just like DeepDiff and have the same type as their counterparts.
+    For example [1] == [1.0] but DeepDiff reports the type change.
+    """
+    t1_type = type(t1)
+    if t1_type is not type(t2):
+        return False
+    if t1_type in NATIVE_EQUALITY_LEAF_TYPES:
+        return t1 == t2
+    if t1_type not in NATIVE_EQUALITY_CONTAINER_TYPES:
+        return False
+    try:
+        if t1 != t2:
+            return False
+    except Exception:
+        # Such as numpy arrays inside the containers that can't be converted to a bool.
+        return False
+
+    # Now that t1 == t2, the types of the items are checked.
+    stack = [(t1, t2)]
+    while stack:
+        t1, t2 = stack.pop()
+        if type(t1) is dict:
+            t1_items = list(t1.values())
+            t2_items = list(map(t2.__getitem__, t1))
+        else:
+            t1_items = t1
+            t2_items = t2
+        t1_types = list(map(type, t1_items))
+        if t1_types != list(map(type, t2_items)):
+            return False
+        types = set(t1_types)
+        if not types <= NATIVE_EQUALITY_TYPES:
+            return False
+        if not types.isdisjoint(NATIVE_EQUALITY_CONTAINER_TYPES):
+            stack.extend(
+                (item1, item2) for item1, item2, item_type in zip(t1_items, t2_items, t1_types)
+                if item_type in NATIVE_EQUALITY_CONTAINER_TYPES)
+    return True
+
+
+def _leaf_diff_method(method):
+    def diff_method(self, level, parents_ids, _original_type):
+        method(self, level)
+    return diff_method
+
+
+def _container_diff_method(method):
+    def diff_method(self, level, parents_ids, _original_type):
+        return method(self, level, parents_ids)
+    return diff_method
+
+
+def _booleans_diff_method(method):
+    def diff_method(self, level, parents_ids, _original_type):
+        self._diff_booleans(level)
+        return method(self, level, parents_ids, _original_type)
+    return diff_method
+
+
+def _find_diff_method(obj):
+    """
+    Find the method to diff objects of the type of obj.
+    All the methods are called with (self, level, parents_ids, _original_type) and
+    return the generator of the child levels when the objects are containers.
+    """
+    if isinstance(obj, strings):
+        method = _leaf_diff_method(DeepDiff._diff_str)
+
+    elif isinstance(obj, times):
+        method = _leaf_diff_method(DeepDiff._diff_datetimes)
+
+    elif isinstance(obj, uuids):
+        method = _leaf_diff_method(DeepDiff._diff_uuids)
+
+    elif isinstance(obj, numbers):
+        method = _leaf_diff_method(DeepDiff._diff_numbers)
+
+    elif isinstance(obj, Mapping):
+        method = _container_diff_method(DeepDiff._diff_dict)
+
+    elif isinstance(obj, tuple):
+        method = _container_diff_method(DeepDiff._diff_tuple)
+
+    elif isinstance(obj, (set, frozenset, OrderedSet)):
+        method = _leaf_diff_method(DeepDiff._diff_set)
+
+    elif isinstance(obj, np_ndarray):
+        method = _container_diff_method(DeepDiff._diff_numpy_array)
+
+    elif isinstance(obj, Iterable):
+        method = DeepDiff._diff_iterable
+
+    else:
+        method = _container_diff_method(DeepDiff._diff_obj)
+
+    if isinstance(obj, booleans):
+        if isinstance(obj, numbers):
+            # Python's booleans are numbers too. Comparing them as booleans is enough
+            # so the same change is not reported twice.
+            method = _leaf_diff_method(DeepDiff._diff_booleans)
+        else:
+            method = _booleans_diff_method(method)
+    return method
+
+
 class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
     __doc__ = doc
 
+    # The diff method of each type of object that is diffed.
+    _diff_methods = TypeDispatchCache(_find_diff_method)
+
     CACHE_AUTO_ADJUST_THRESHOLD = 0.25
 
     def __init__(self,
@@ -133,37 +279,53 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
                  ignore_string_type_changes=False,
                  ignore_type_in_groups=None,
                  ignore_type_subclasses=False,
+                 include_paths=None,
+                 iterable_alignment=None,
                  iterable_compare_func=None,
+                 iterable_key_func=None,
                  log_frequency_in_sec=0,
+                 lsh_bands_for_pairs=0,
                  math_epsilon=None,
+                 max_candidates_for_pairs=None,
                  max_diffs=None,
                  max_passes=10000000,
+                 memory_budget_for_pairs=MEMORY_BUDGET_FOR_PAIRS_DEFAULT,
                  number_format_notation="f",
                  number_to_string_func=None,
+                 numpy_chunk_size=NUMPY_CHUNK_SIZE_DEFAULT,
+                 optimal_pairs=False,
+                 partition_key_func=None,
                  progress_logger=logger.info,
+                 prune_equal_subtrees=False,
                  report_repetition=False,
                  significant_digits=None,
                  truncate_datetime=None,
                  verbose_level=1,
                  view=TEXT_VIEW,
+                 _max_diff_length=None,
                  _original_type=None,
                  _parameters=None,
                  _shared_parameters=None,
+                 _stream_changes=False,
                  **kwargs):
         super().__init__()
         if kwargs:
             raise ValueError((
                 "The following parameter(s) are not valid: %s\n"
                 "The valid parameters are ignore_order, report_repetition, significant_digits, "
-                "number_format_notation, exclude_paths, exclude_types, exclude_regex_paths, ignore_type_in_groups, "
+                "number_format_notation, exclude_paths, include_paths, exclude_types, exclude_regex_paths, "
+                "ignore_type_in_groups, "
                 "ignore_string_type_changes, ignore_numeric_type_changes, ignore_type_subclasses, truncate_datetime, "
-                "ignore_private_variables, ignore_nan_inequality, number_to_string_func, verbose_level, "
+                "ignore_private_variables, ignore_nan_inequality, number_to_string_func, numpy_chunk_size, "
+                "verbose_level, "
                 "view, hasher, hashes, max_passes, max_diffs, "
-                "cutoff_distance_for_pairs, cutoff_intersection_for_pairs, log_frequency_in_sec, cache_size, "
+                "cutoff_distance_for_pairs, cutoff_intersection_for_pairs, lsh_bands_for_pairs, "
+                "max_candidates_for_pairs, "
+                "memory_budget_for_pairs, optimal_pairs, partition_key_func, log_frequency_in_sec, cache_size, "
                 "cache_tuning_sample_size, get_deep_distance, group_by, cache_purge_level, "
-                "math_epsilon, iterable_compare_func, _original_type, "
-                "ignore_order_func, custom_operators, encodings, ignore_encoding_errors, "
-                "_parameters and _shared_parameters.") % ', '.join(kwargs.keys()))
+                "math_epsilon, iterable_alignment, iterable_compare_func, iterable_key_func, _original_type, "
+                "ignore_order_func, custom_operators, encodings, ignore_encoding_errors, prune_equal_subtrees, "
+                "_max_diff_length, _parameters, _shared_parameters and _stream_changes.") % ', '.join(kwargs.keys()))
 
         if _parameters:
             self.__dict__.update(_parameters)
@@ -188,6 +350,7 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
             self.report_repetition = report_repetition
             self.exclude_paths = convert_item_or_items_into_set_else_none(exclude_paths)
             self.exclude_regex_paths = convert_item_or_items_into_compiled_regexes_else_none(exclude_regex_paths)
+            self.include_paths = convert_item_or_items_into_set_else_none(include_paths)
             self.exclude_types = set(exclude_types) if exclude_types else None
             self.exclude_types_tuple = tuple(exclude_types) if exclude_types else None  # we need tuple for checking isinstance
             self.ignore_type_subclasses = ignore_type_subclasses
@@ -195,7 +358,15 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
             self.ignore_string_case = ignore_string_case
             self.exclude_obj_callback = exclude_obj_callback
             self.number_to_string = number_to_string_func or number_to_string
+            if iterable_key_func is not None and iterable_compare_func is not None:
+                raise ValueError(ITERABLE_KEY_AND_COMPARE_FUNC_MSG)
             self.iterable_compare_func = iterable_compare_func
+            self.iterable_key_func = iterable_key_func
+            if iterable_alignment not in ITERABLE_ALIGNMENTS:
+                raise ValueError(INVALID_ITERABLE_ALIGNMENT_MSG.format(iterable_alignment))
+            if iterable_alignment is not None and (iterable_key_func is not None or iterable_compare_func is not None):
+                raise ValueError(ITERABLE_ALIGNMENT_WITH_FUNC_MSG)
+            self.iterable_alignment = iterable_alignment
             self.ignore_private_variables = ignore_private_variables
             self.ignore_nan_inequality = ignore_nan_inequality
             self.hasher = hasher
@@ -224,12 +395,41 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
             self.cutoff_intersection_for_pairs = float(cutoff_intersection_for_pairs)
             if self.cutoff_distance_for_pairs < 0 or self.cutoff_distance_for_pairs > 1:
                 raise ValueError(CUTOFF_RANGE_ERROR_MSG)
+            # bool is a subclass of int but True is not a number of bands.
+            is_int = isinstance(lsh_bands_for_pairs, int) and not isinstance(lsh_bands_for_pairs, bool)
+            if not is_int or lsh_bands_for_pairs < 0:
+                raise ValueError(LSH_BANDS_FOR_PAIRS_MSG)
+            if lsh_bands_for_pairs and np is None:
+                logger.warning("lsh_bands_for_pairs will be ignored. It needs Numpy to be installed.")
+            self.lsh_bands_for_pairs = lsh_bands_for_pairs
+            if max_candidates_for_pairs is not None and (
+                    not isinstance(max_candidates_for_pairs, int) or max_candidates_for_pairs < 1):
+                raise ValueError(MAX_CANDIDATES_FOR_PAIRS_MSG)
+            self.max_candidates_for_pairs = max_candidates_for_pairs
+            if not isinstance(memory_budget_for_pairs, int) or memory_budget_for_pairs < 1:
+                raise ValueError(MEMORY_BUDGET_FOR_PAIRS_MSG)
+            self.memory_budget_for_pairs = memory_budget_for_pairs
+            if not isinstance(numpy_chunk_size, int) or numpy_chunk_size < 1:
+                raise ValueError(NUMPY_CHUNK_SIZE_MSG)
+            self.numpy_chunk_size = numpy_chunk_size
+            if optimal_pairs and np is None:
+                logger.warning("optimal_pairs will be ignored. It needs Numpy to be installed.")
+            self.optimal_pairs = optimal_pairs
+            if not (partition_key_func is None or partition_key_func == 'type' or callable(partition_key_func)):
+                raise ValueError(INVALID_PARTITION_KEY_FUNC_MSG.format(partition_key_func))
+            self.partition_key_func = partition_key_func
             # _Parameters are the clean _parameters to initialize DeepDiff with so we avoid all the above
             # cleaning functionalities when running DeepDiff recursively.
             # However DeepHash has its own set of _parameters that are slightly different than DeepDIff.
             # DeepDiff _parameters are transformed to DeepHash _parameters via _get_deephash_params method.
             self.progress_logger = progress_logger
             self.cache_size = cache_size
+            # Pruning trusts the hashes to decide equality, so it can't be used when the user has
+            # taken control of how items are compared. The hashes are cached by object and not by path.
+            # So it can't be used either when what is excluded depends on the path.
+            self.prune_equal_subtrees = bool(prune_equal_subtrees) and not any((
+                self.custom_operators, self.iterable_compare_func, self.iterable_key_func, self.exclude_paths,
+                self.exclude_regex_paths, self.include_paths, self.exclude_obj_callback))
             _parameters = self.__dict__.copy()
 
         # Non-Root
@@ -256,8 +456,17 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
             }
             self.hashes = dict_() if hashes is None else hashes
             self._numpy_paths = dict_()  # if _numpy_paths is None else _numpy_paths
+            if ignore_order and ignore_order_func is None and ignore_numeric_type_changes:
+                # The order insensitive hashes that are calculated for ignore_order can be reused for pruning.
+                # They are stored by the objects so items such as 1 and 1.0 share their hashes, which is only
+                # fine when the numeric type changes are ignored.
+                self._prune_hashes = self.hashes
+            else:
+                # The hashes need to be order sensitive and items such as 1 and 1.0 can't share their hashes.
+                self._prune_hashes = HashesByType()
             self._shared_parameters = {
                 'hashes': self.hashes,
+                '_prune_hashes': self._prune_hashes,
                 '_stats': self._stats,
                 '_distance_cache': self._distance_cache,
                 '_numpy_paths': self._numpy_paths,
@@ -271,6 +480,16 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
 
         self._parameters = _parameters
         self.deephash_parameters = self._get_deephash_params()
+        self._exclude_paths_filter = get_path_filter(self.exclude_paths)
+        self._include_paths_filter = get_path_filter(self.include_paths)
+        # Python's == can only tell that there is no difference when the user has not taken control of the comparison.
+        self._use_native_equality = not any((
+            self.custom_operators, getattr(self, 'iterable_compare_func', None),
+            getattr(self, 'iterable_key_func', None)))
+        # When the items are aligned, an item that is removed and another item that is added at the same index
+        # are not in the same place. So they can't become a value change.
+        self._merge_mutual_add_removes = (
+            not self.report_repetition and getattr(self, 'iterable_alignment', None) is None)
         self.tree = TreeResult()
         if group_by and self.is_root:
             try:
@@ -286,13 +505,51 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
 
         self.t1 = t1
         self.t2 = t2
+        if self.is_root:
+            self._diff_methods.refresh()
+
+        self._stream_changes = _stream_changes
+        self._ignore_order_levels_in_progress = 0
+        self._prune_nan_results = {}
+        # The diffs that are only run to get the rough distance of the potential pairs count the length
+        # of the diff instead of reporting the changes and stop once they are longer than _max_diff_length.
+        self._max_diff_length = _max_diff_length
+        self._diff_length = 0
+        self._counted_reports = set()
+        if _stream_changes:
+            # The reports only stay in the tree until they are yielded.
+            self.tree = defaultdict(PrettyOrderedSet)
+        changes = self._diff_root(
+            t1, t2, _original_type=_original_type, get_deep_distance=get_deep_distance,
+            cache_purge_level=cache_purge_level, progress_timer=progress_timer)
+        if _stream_changes:
+            # The changes are consumed by iter_diff.
+            self._changes = changes
+        else:
+            for _ in changes:
+                pass
 
+    def _diff_root(self, t1, t2, _original_type, get_deep_distance, cache_purge_level, progress_timer):
+        """
+        Diff the root level and build the results.
+        This is a generator so that the changes can be streamed. When they are, the changes are yielded
+        as they are found and the results are not built. Otherwise nothing is yielded.
+        """
+        view = self.view
         try:
             root = DiffLevel(t1, t2, verbose_level=self.verbose_level)
             # _original_type is only used to pass the original type of the data. Currently only used for numpy arrays.
             # The reason is that we convert the numpy array to python list and then later for distance calculations
             # we convert only the the last dimension of it into numpy arrays.
-            self._diff(root, parents_ids=frozenset({id(t1)}), _original_type=_original_type)
+            for _ in self._iter_diff(root, parents_ids=frozenset({id(t1)}), _original_type=_original_type):
+                yield from self._pop_changes()
+            if self._stream_changes:
+                yield from self._pop_changes()
+                return
+            if self._max_diff_length is not None:
+                # Only the length of the diff is needed to get the distance so the results are not built.
+                self._count_removed_items_length()
+                return
 
             if get_deep_distance and view in {TEXT_VIEW, TREE_VIEW}:
                 self.tree['deep_distance'] = self._get_rough_distance()
@@ -305,6 +562,8 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
                 if cache_purge_level:
                     del self._distance_cache
                     del self.hashes
+                    del self._prune_hashes
+                    del self._prune_nan_results
                 del self._shared_parameters
                 del self._parameters
                 for key in (PREVIOUS_DIFF_COUNT, PREVIOUS_DISTANCE_CACHE_HIT_COUNT,
@@ -317,6 +576,25 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
                 if cache_purge_level == 2:
                     self.__dict__.clear()
 
+    def _pop_changes(self):
+        """
+        Get the changes that are reported so far as (report_type, path, old, new) tuples and start a new tree.
+        Nothing is returned while an iterable that ignores the order is being diffed.
+        """
+        tree = self.tree
+        if not tree or self._ignore_order_levels_in_progress:
+            return ()
+        self.tree = defaultdict(PrettyOrderedSet)
+        if self._merge_mutual_add_removes and 'iterable_item_added' in tree and 'iterable_item_removed' in tree:
+            tree_result = TreeResult()
+            tree_result.update(tree)
+            tree_result.mutual_add_removes_to_become_value_changes()
+            tree = tree_result
+        return [
+            (report_type, level.path(force=FORCE_DEFAULT), level.t1, level.t2)
+            for report_type, levels in tree.items() for level in levels
+        ]
+
     def _get_deephash_params(self):
         result = {key: self._parameters[key] for key in DEEPHASH_PARAM_KEYS}
         result['ignore_repetition'] = not self.report_repetition
@@ -338,6 +616,10 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
 
         if not self._skip_this(level):
             level.report_type = report_type
+            if self._max_diff_length is not None:
+                self._count_diff_length(report_type, level)
+                return
+            level.materialize_chain()
             self.tree[report_type].add(level)
 
     def custom_report_result(self, report_type, level, extra_info=None):
@@ -356,6 +638,7 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
         if not self._skip_this(level):
             level.report_type = report_type
             level.additional[CUSTOM_FIELD] = extra_info
+            level.materialize_chain()
             self.tree[report_type].add(level)
 
     @staticmethod
@@ -403,7 +686,7 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
                 self._report_result('unprocessed', level)
                 return
 
-        self._diff_dict(
+        yield from self._diff_dict(
             level,
             parents_ids,
             print_as_attribute=True,
@@ -417,7 +700,12 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
         :rtype: bool
         """
         skip = False
-        if self.exclude_paths and level.path() in self.exclude_paths:
+        if self._exclude_paths_filter is not None and \
+                self._exclude_paths_filter.is_match(level.get_path_filter_state(self._exclude_paths_filter)):
+            skip = True
+        elif self._include_paths_filter is not None and \
+                level.get_path_filter_state(self._include_paths_filter) is None:
+            # Only the levels on the way to an included path or inside one are compared.
             skip = True
         elif self.exclude_regex_paths and any(
                 [exclude_regex_path.search(level.path()) for exclude_regex_path in self.exclude_regex_paths]):
@@ -464,7 +752,10 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
                     override=False,
                     override_t1=None,
                     override_t2=None):
-        """Difference of 2 dictionaries"""
+        """
+        Difference of 2 dictionaries.
+        This is a generator of the child levels that need to be diffed and their item ids.
+        """
         if override:
             # for special stuff like custom objects and named tuples we receive preprocessed t1 and t2
             # but must not spoil the chain (=level) with it
@@ -535,7 +826,6 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
             item_id = id(t1[key1])
             if parents_ids and item_id in parents_ids:
                 continue
-            parents_ids_added = add_to_frozen_set(parents_ids, item_id)
 
             # Go one level deeper
             next_level = level.branch_deeper(
@@ -543,7 +833,7 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
                 t2[key2],
                 child_relationship_class=rel_class,
                 child_relationship_param=key)
-            self._diff(next_level, parents_ids_added)
+            yield next_level, item_id
 
     def _diff_set(self, level):
         """Difference of sets"""
@@ -588,9 +878,16 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
     def _diff_iterable(self, level, parents_ids=frozenset(), _original_type=None):
         """Difference of iterables"""
         if self.ignore_order_func(level):
-            self._diff_iterable_with_deephash(level, parents_ids, _original_type=_original_type)
+            # The items that are removed and added at the same path are only merged into values_changed
+            # when they are reported in the same batch of streamed changes. When the order is ignored,
+            # they are found at different times. So the changes are held until the iterable is fully diffed.
+            self._ignore_order_levels_in_progress += 1
+            try:
+                yield from self._diff_iterable_with_deephash(level, parents_ids, _original_type=_original_type)
+            finally:
+                self._ignore_order_levels_in_progress -= 1
         else:
-            self._diff_iterable_in_order(level, parents_ids, _original_type=_original_type)
+            yield from self._diff_iterable_in_order(level, parents_ids, _original_type=_original_type)
 
     def _compare_in_order(self, level):
         """
@@ -598,9 +895,9 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
         This will compare in sequence order.
         """
 
-        return [((i, i), (x, y)) for i, (x, y) in enumerate(
+        return (((i, i), (x, y)) for i, (x, y) in enumerate(
             zip_longest(
-                level.t1, level.t2, fillvalue=ListItemRemovedOrAdded))]
+                level.t1, level.t2, fillvalue=ListItemRemovedOrAdded)))
 
     def _get_matching_pairs(self, level):
         """
@@ -609,11 +906,18 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
           (t1 index, t2 index), (t1 item, t2 item)
         ]
 
-        This will compare using the passed in `iterable_compare_func` if available.
+        This will compare using the passed in `iterable_compare_func` or `iterable_key_func` if available.
         Default it to compare in order
         """
+        if self.iterable_key_func is not None:
+            try:
+                return self._get_matching_pairs_by_key(level)
+            except CannotCompare:
+                return self._compare_in_order(level)
 
         if(self.iterable_compare_func is None):
+            if self.iterable_alignment == 'lcs':
+                return self._get_matching_pairs_by_alignment(level)
             # Match in order if there is no compare function provided
             return self._compare_in_order(level)
         try:
@@ -631,32 +935,117 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
                         continue
 
                     if(self.iterable_compare_func(x, y, level)):
-                        deep_hash = DeepHash(y,
-                                             hashes=self.hashes,
-                                             apply_hash=True,
-                                             **self.deephash_parameters,
-                                             )
                         y_index_matched.add(j)
-                        y_matched.add(deep_hash[y])
                         matches.append(((i, j), (x, y)))
                         x_found = True
                         break
 
                 if(not x_found):
                     matches.append(((i, -1), (x, ListItemRemovedOrAdded)))
-            for j, y in enumerate(level.t2):
 
+            # Every item of t2 is hashed only once.
+            t2_hashes = []
+            for j, y in enumerate(level.t2):
                 deep_hash = DeepHash(y,
                                      hashes=self.hashes,
                                      apply_hash=True,
                                      **self.deephash_parameters,
                                      )
-                if(deep_hash[y] not in y_matched):
+                t2_hashes.append(deep_hash[y])
+                if j in y_index_matched:
+                    y_matched.add(t2_hashes[j])
+            for j, y in enumerate(level.t2):
+                if(t2_hashes[j] not in y_matched):
                     matches.append(((-1, j), (ListItemRemovedOrAdded, y)))
             return matches
         except CannotCompare:
             return self._compare_in_order(level)
 
+    def _get_matching_pairs_by_key(self, level):
+        """
+        Pairs the items of t1 and t2 that have the same key according to `iterable_key_func`.
+        Each item of t1 is paired with the first item of t2 with the same key that is not paired yet.
+        That is the same pairing as `iterable_compare_func` with key equality but done in O(n+m)
+        by mapping the keys of t2 to their indexes instead of comparing every x with every y.
+        """
+        key_func = self.iterable_key_func
+        t2_items = list(level.t2)
+        t2_indexes_by_key = dict_()
+        for j, y in enumerate(t2_items):
+            key = key_func(y, level)
+            if key in t2_indexes_by_key:
+                t2_indexes_by_key[key].append(j)
+            else:
+                t2_indexes_by_key[key] = deque([j])
+
+        matches = []
+        t2_matched = [False] * len(t2_items)
+        for i, x in enumerate(level.t1):
+            t2_indexes = t2_indexes_by_key.get(key_func(x, level))
+            if t2_indexes:
+                j = t2_indexes.popleft()
+                t2_matched[j] = True
+                matches.append(((i, j), (x, t2_items[j])))
+            else:
+                matches.append(((i, -1), (x, ListItemRemovedOrAdded)))
+        for j, y in enumerate(t2_items):
+            if not t2_matched[j]:
+                matches.append(((-1, j), (ListItemRemovedOrAdded, y)))
+        return matches
+
+    def _get_item_hashes(self, obj, items, parent):
+        """
+        Get the order sensitive hashes of the items of an iterable.
+        The whole iterable is hashed at once and then the hashes of the items are looked up.
+        Returns None if any of the items could not be hashed.
+        """
+        hashes = self._prune_hashes
+        if self._get_subtree_hash(obj, hashes, parent) is None:
+            return None
+        result = []
+        for item in items:
+            item_hash = DeepHash.get_key(hashes, item)
+            if item_hash is None or item_hash is unprocessed:
+                return None
+            result.append(item_hash)
+        return result
+
+    def _get_matching_pairs_by_alignment(self, level):
+        """
+        Used by iterable_alignment='lcs'.
+        Aligns the items of t1 and t2 by their hashes using difflib's SequenceMatcher.
+        The runs of items that are the same on both sides are skipped. The items in the runs that are replaced
+        are paired in order and the rest are reported as removed or added.
+        So inserting an item at the beginning of a list is reported as only one added item.
+        """
+        parent = level.path()
+        if parent is None:
+            return self._compare_in_order(level)
+        t1_items = list(level.t1)
+        t2_items = list(level.t2)
+        try:
+            t1_hashes = self._get_item_hashes(level.t1, t1_items, parent)
+            t2_hashes = None if t1_hashes is None else self._get_item_hashes(level.t2, t2_items, parent)
+        except Exception as e:  # pragma: no cover
+            logger.debug("Can not produce the hashes to align the items of %s. %s" % (parent, e))
+            t2_hashes = None
+        if t2_hashes is None:
+            return self._compare_in_order(level)
+
+        matches = []
+        matcher = difflib.SequenceMatcher(a=t1_hashes, b=t2_hashes)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                continue
+            for i, j in zip_longest(range(i1, i2), range(j1, j2), fillvalue=-1):
+                if j == -1:
+                    matches.append(((i, j), (t1_items[i], ListItemRemovedOrAdded)))
+                elif i == -1:
+                    matches.append(((i, j), (ListItemRemovedOrAdded, t2_items[j])))
+                else:
+                    matches.append(((i, j), (t1_items[i], t2_items[j])))
+        return matches
+
     def _diff_iterable_in_order(self, level, parents_ids=frozenset(), _original_type=None):
         # We're handling both subscriptable and non-subscriptable iterables. Which one is it?
         subscriptable = self._iterables_subscriptable(level.t1, level.t2)
@@ -701,15 +1090,15 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
                 item_id = id(x)
                 if parents_ids and item_id in parents_ids:
                     continue
-                parents_ids_added = add_to_frozen_set(parents_ids, item_id)
 
                 # Go one level deeper
                 next_level = level.branch_deeper(
                     x,
                     y,
                     child_relationship_class=child_relationship_class,
-                    child_relationship_param=i)
-                self._diff(next_level, parents_ids_added)
+                    child_relationship_param=i,
+                    child_relationship_param2=j)
+                yield next_level, item_id
 
     def _diff_str(self, level):
         """Compare strings"""
@@ -757,10 +1146,10 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
             level.t1._asdict
         # It must be a normal tuple
         except AttributeError:
-            self._diff_iterable(level, parents_ids)
+            yield from self._diff_iterable(level, parents_ids)
         # We assume it is a namedtuple then
         else:
-            self._diff_obj(level, parents_ids, is_namedtuple=True)
+            yield from self._diff_obj(level, parents_ids, is_namedtuple=True)
 
     def _add_hash(self, hashes, item_hash, item, i):
         if item_hash in hashes:
@@ -768,6 +1157,136 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
         else:
             hashes[item_hash] = IndexedHash(indexes=[i], item=item)
 
+    def _create_hashtables_by_value(self, level):
+        """
+        Used when ignoring the order of 2 lists or tuples whose items are all strings, numbers, booleans or None.
+        Creates the hashtables of t1 and t2 by the values of their items instead of running DeepHash for every item.
+        Only the items that are not in both hashtables are hashed with DeepHash since their pairs are found
+        by their hashes. The other items stay keyed by their values. The strings are wrapped in tuples
+        so they are never the same as a hash.
+        Returns None if the items are of other types or the parameters change how they are hashed.
+        """
+        if any((
+            type(level.t1) not in {list, tuple}, type(level.t2) not in {list, tuple},
+            self.exclude_paths, self.include_paths, self.exclude_regex_paths, self.exclude_types_tuple,
+            self.exclude_obj_callback, self.significant_digits is not None, self.ignore_string_case,
+            self.ignore_string_type_changes, self.ignore_numeric_type_changes,
+        )):
+            return None
+
+        hashtables = []
+        for obj in (level.t1, level.t2):
+            hashtable = dict_()
+            for i, item in enumerate(obj):
+                item_type = type(item)
+                if item_type is str:
+                    if item.startswith(STRINGS_HASHED_AS_OTHER_TYPES_PREFIXES):
+                        return None
+                    key = (item, )
+                elif item_type not in HASHED_BY_VALUE_TYPES:
+                    return None
+                elif item_type is bool:
+                    key = (bool, item)
+                elif item != item:
+                    key = _NAN_VALUE
+                else:
+                    key = item
+                indexed_hash = hashtable.get(key)
+                if indexed_hash is None:
+                    hashtable[key] = IndexedHash(indexes=[i], item=item)
+                else:
+                    indexed_hash.indexes.append(i)
+            hashtables.append(hashtable)
+        return self._hash_items_not_in_both_hashtables(*hashtables)
+
+    def _create_hashtables_of_numpy_rows(self, level, t1, t2):
+        """
+        Used when ignoring the order of the rows of 2 numpy arrays with 1 or 2 dimensions and the same dtype
+        of booleans, integers or floats.
+        t1 and t2 are the arrays while the items of level.t1 and level.t2 are the rows to diff.
+        Creates the hashtables of t1 and t2 by comparing the bytes of their rows with Numpy instead of running DeepHash
+        for every row. The values of each row are sorted first and the repeated values are dropped unless repetitions
+        are reported, since that is how DeepHash hashes a list when the order is ignored.
+        The values are rounded first when significant_digits is passed.
+        Just like _create_hashtables_by_value, only the rows that are not in both hashtables are hashed with DeepHash.
+        Returns None if the arrays are of other dtypes or shapes or the parameters change how the values are hashed.
+        """
+        if any((
+            t1.dtype != t2.dtype, t1.dtype.kind not in NUMPY_VECTORIZED_DIFF_KINDS, t1.dtype.itemsize > 8,
+            t1.ndim not in {1, 2}, t1.shape[1:] != t2.shape[1:], 0 in t1.shape[1:],
+            # The items of 1 dimensional arrays are numpy scalars and DeepHash can not hash numpy booleans.
+            t1.ndim == 1 and t1.dtype.kind == 'b',
+            self.exclude_paths, self.include_paths, self.exclude_regex_paths, self.exclude_types_tuple,
+            self.exclude_obj_callback,
+        )):
+            return None
+        row_length = t1.shape[1] if t1.ndim == 2 else 1
+        rows = np.concatenate([t1.reshape(len(t1), row_length), t2.reshape(len(t2), row_length)])
+        is_float = rows.dtype.kind == 'f'
+        if is_float:
+            rows = rows.astype(np.float64)
+            if self.significant_digits is not None:
+                formats_numbers_like_python = (
+                    self.number_to_string is number_to_string and self.number_format_notation == 'f')
+                if self.significant_digits > 15 or not formats_numbers_like_python:
+                    return None
+                # Same as in _get_numpy_chunk_changed_indexes, the numbers that are too close to a tie after being
+                # scaled could be rounded differently by Python.
+                rows *= 10.0 ** self.significant_digits
+                rounded = np.rint(rows)
+                with np.errstate(invalid='ignore'):
+                    if (np.abs(np.abs(rows - rounded) - 0.5) <= np.abs(rows) * 2.0 ** -50).any():
+                        return None
+                rows = rounded
+            # All the nans are hashed the same. 0.0 and -0.0 share their hash since the hashes are keyed by the numbers.
+            rows += 0.0
+            rows[np.isnan(rows)] = np.nan
+        elif self.significant_digits is not None and rows.dtype.kind != 'b':
+            return None
+        if row_length > 1:
+            rows.sort(axis=1)
+            if not self.report_repetition:
+                # The repeated values are replaced by the largest value of the row, which is the last one.
+                # So the rows with the same unique values end up the same after being sorted again.
+                repeated = np.zeros(rows.shape, dtype=bool)
+                repeated[:, 1:] = rows[:, 1:] == rows[:, :-1]
+                if is_float:
+                    repeated[:, 1:] |= np.isnan(rows[:, 1:]) & np.isnan(rows[:, :-1])
+                rows = np.where(repeated, rows[:, -1:], rows)
+                rows.sort(axis=1)
+        rows = np.ascontiguousarray(rows)
+        keys = rows.view(np.dtype((np.void, rows.dtype.itemsize * row_length))).ravel()
+        ids = np.unique(keys, return_inverse=True)[1].ravel().tolist()
+
+        hashtables = []
+        for obj, obj_ids in ((level.t1, ids[:len(t1)]), (level.t2, ids[len(t1):])):
+            hashtable = dict_()
+            for i, (key, item) in enumerate(zip(obj_ids, obj)):
+                indexed_hash = hashtable.get(key)
+                if indexed_hash is None:
+                    hashtable[key] = IndexedHash(indexes=[i], item=item)
+                else:
+                    indexed_hash.indexes.append(i)
+            hashtables.append(hashtable)
+        return self._hash_items_not_in_both_hashtables(*hashtables)
+
+    def _hash_items_not_in_both_hashtables(self, t1_hashtable, t2_hashtable):
+        """
+        Replace the keys of the items that are only in one of the hashtables with the DeepHash of the items.
+        The keys of the other items are left alone since those items are the same on both sides.
+        """
+        result = []
+        for hashtable, other_hashtable in ((t1_hashtable, t2_hashtable), (t2_hashtable, t1_hashtable)):
+            new_hashtable = dict_()
+            for key, indexed_hash in hashtable.items():
+                if key not in other_hashtable:
+                    key = DeepHash(
+                        indexed_hash.item, hashes=self.hashes, apply_hash=True, **self.deephash_parameters
+                    )[indexed_hash.item]
+                new_hashtable[key] = indexed_hash
+            result.append(new_hashtable)
+        return result
+
     def _create_hashtable(self, level, t):
         """Create hashtable of {item_hash: (indexes, item)}"""
         obj = getattr(level, t)
@@ -847,15 +1366,22 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
             # We can only cache the rough distance and not the actual diff result for reuse.
             # The reason is that we have modified the parameters explicitly so they are different and can't
             # be used for diff reporting
-            diff = DeepDiff(
-                removed_hash_obj.item, added_hash_obj.item,
-                _parameters=self._parameters,
-                _shared_parameters=self._shared_parameters,
-                view=DELTA_VIEW,
-                _original_type=_original_type,
-                iterable_compare_func=self.iterable_compare_func,
-            )
-            _distance = diff._get_rough_distance()
+            try:
+                diff = DeepDiff(
+                    removed_hash_obj.item, added_hash_obj.item,
+                    _parameters=self._parameters,
+                    _shared_parameters=self._shared_parameters,
+                    view=DELTA_VIEW,
+                    _original_type=_original_type,
+                    iterable_compare_func=self.iterable_compare_func,
+                    _max_diff_length=self._get_max_diff_length_for_pairs(
+                        removed_hash_obj.item, added_hash_obj.item),
+                )
+            except DiffLengthLimitReached:
+                # The objects are too far to be pairs so there is no need to finish the diff.
+                _distance = 1
+            else:
+                _distance = diff._get_rough_distance()
             if cache_key and self._stats[DISTANCE_CACHE_ENABLED]:
                 self._distance_cache.set(cache_key, value=_distance)
         return _distance
@@ -895,21 +1421,38 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
         most_in_common_pairs = defaultdict(lambda: defaultdict(OrderedSetPlus))
         pairs = dict_()
 
-        pre_calced_distances = None
+        pre_calced_distances = numpy_distances = None
+        several_items_to_pair = len(hashes_added) > 1 and len(hashes_removed) > 1
 
-        if hashes_added and hashes_removed and np and len(hashes_added) > 1 and len(hashes_removed) > 1:
+        if several_items_to_pair and self.iterable_compare_func:
+            pre_calced_distances = self._precalculate_distance_by_custom_compare_func(
+                hashes_added, hashes_removed, t1_hashtable, t2_hashtable, _original_type)
+        elif several_items_to_pair and np:
             # pre-calculates distances ONLY for 1D arrays whether an _original_type
             # was explicitly passed or a homogeneous array is detected.
             # Numpy is needed for this optimization.
-            pre_calced_distances = self._precalculate_numpy_arrays_distance(
+            numpy_distances = self._precalculate_numpy_arrays_distance(
                 hashes_added, hashes_removed, t1_hashtable, t2_hashtable, _original_type)
+            if numpy_distances is None:
+                # The records such as rows of a table can be compared column by column.
+                numpy_distances = self._precalculate_records_distance(
+                    hashes_added, hashes_removed, t1_hashtable, t2_hashtable, _original_type)
 
-        if hashes_added and hashes_removed and self.iterable_compare_func and len(hashes_added) > 1 and len(hashes_removed) > 1:
-            pre_calced_distances = self._precalculate_distance_by_custom_compare_func(
-                hashes_added, hashes_removed, t1_hashtable, t2_hashtable, _original_type)
+        lsh_candidates = None
+        use_lsh = several_items_to_pair and self.lsh_bands_for_pairs and np
+        if use_lsh and numpy_distances is None and not pre_calced_distances:
+            lsh_candidates = self._get_lsh_candidates(hashes_added, hashes_removed, t1_hashtable, t2_hashtable)
 
         for added_hash in hashes_added:
-            for removed_hash in hashes_removed:
+            if numpy_distances is not None:
+                # The pairs that are too far and the ones beyond max_candidates_for_pairs are already left out.
+                for removed_hash, _distance in numpy_distances.get(added_hash, ()):
+                    most_in_common_pairs[added_hash][_distance].add(removed_hash)
+                continue
+            distances_of_item = []
+            # Without the candidates, every added item is compared with every removed item.
+            candidate_hashes = hashes_removed if lsh_candidates is None else lsh_candidates.get(added_hash, ())
+            for removed_hash in candidate_hashes:
                 added_hash_obj = t2_hashtable[added_hash]
                 removed_hash_obj = t1_hashtable[removed_hash]
 
@@ -928,30 +1471,40 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
                 # Discard potential pairs that are too far.
                 if _distance >= self.cutoff_distance_for_pairs:
                     continue
-                pairs_of_item = most_in_common_pairs[added_hash]
-                pairs_of_item[_distance].add(removed_hash)
-        used_to_hashes = set()
-
-        distances_to_from_hashes = defaultdict(OrderedSetPlus)
-        for from_hash, distances_to_to_hashes in most_in_common_pairs.items():
-            # del distances_to_to_hashes['max']
-            for dist in distances_to_to_hashes:
-                distances_to_from_hashes[dist].add(from_hash)
-
-        for dist in sorted(distances_to_from_hashes.keys()):
-            from_hashes = distances_to_from_hashes[dist]
-            while from_hashes:
-                from_hash = from_hashes.lpop()
-                if from_hash not in used_to_hashes:
-                    to_hashes = most_in_common_pairs[from_hash][dist]
-                    while to_hashes:
-                        to_hash = to_hashes.lpop()
-                        if to_hash not in used_to_hashes:
-                            used_to_hashes.add(from_hash)
-                            used_to_hashes.add(to_hash)
-                            # Left for future debugging:
-                            # print(f'{bcolors.FAIL}Adding {t2_hashtable[from_hash].item} as a pairs of {t1_hashtable[to_hash].item} with distance of {dist}{bcolors.ENDC}')
-                            pairs[from_hash] = to_hash
+                distances_of_item.append((removed_hash, _distance))
+            if self.max_candidates_for_pairs and len(distances_of_item) > self.max_candidates_for_pairs:
+                # Only the closest ones are kept and they stay in the same order.
+                closest = set(heapq.nsmallest(
+                    self.max_candidates_for_pairs, range(len(distances_of_item)),
+                    key=lambda i: distances_of_item[i][1]))
+                distances_of_item = [item for i, item in enumerate(distances_of_item) if i in closest]
+            for removed_hash, _distance in distances_of_item:
+                most_in_common_pairs[added_hash][_distance].add(removed_hash)
+        if self.optimal_pairs and np:
+            # The pairs are chosen together so that their total distance is the smallest
+            # instead of taking the closest pairs first.
+            pairs = self._get_optimal_pairs(most_in_common_pairs)
+        else:
+            used_to_hashes = set()
+
+            distances_to_from_hashes = defaultdict(OrderedSetPlus)
+            for from_hash, distances_to_to_hashes in most_in_common_pairs.items():
+                # del distances_to_to_hashes['max']
+                for dist in distances_to_to_hashes:
+                    distances_to_from_hashes[dist].add(from_hash)
+
+            for dist in sorted(distances_to_from_hashes.keys()):
+                from_hashes = distances_to_from_hashes[dist]
+                # Iterating instead of popping from the left since each lpop moves all the other items.
+                for from_hash in from_hashes:
+                    if from_hash not in used_to_hashes:
+                        to_hashes = most_in_common_pairs[from_hash][dist]
+                        while to_hashes:
+                            to_hash = to_hashes.lpop()
+                            if to_hash not in used_to_hashes:
+                                used_to_hashes.add(from_hash)
+                                used_to_hashes.add(to_hash)
+                                pairs[from_hash] = to_hash
 
         inverse_pairs = {v: k for k, v in pairs.items()}
         pairs.update(inverse_pairs)
@@ -959,11 +1512,68 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
             self._distance_cache.set(cache_key, value=pairs)
         return pairs.copy()
 
-    def _diff_iterable_with_deephash(self, level, parents_ids, _original_type=None):
-        """Diff of hashable or unhashable iterables. Only used when ignoring the order."""
+    def _get_type_partition_key(self, item, level):
+        """
+        Used by partition_key_func='type'.
+        The items of the types that are in the same group of ignore_type_in_groups get the same key.
+        """
+        for i, type_group in enumerate(self.ignore_type_in_groups):
+            if self.type_check_func(item, type_group):
+                return i
+        return get_type(item)
 
-        full_t1_hashtable = self._create_hashtable(level, 't1')
-        full_t2_hashtable = self._create_hashtable(level, 't2')
+    def _get_partitions(self, hashes, hashtable, level):
+        """
+        Split the hashes into ordered sets by the partition key of their items.
+        """
+        if self.partition_key_func == 'type':
+            key_func = self._get_type_partition_key
+        else:
+            key_func = self.partition_key_func
+        partitions = dict_()
+        for hash_ in hashes:
+            key = key_func(hashtable[hash_].item, level)
+            if key in partitions:
+                partitions[key].add(hash_)
+            else:
+                partitions[key] = OrderedSetPlus([hash_])
+        return partitions
+
+    def _get_most_in_common_pairs_in_partitions(
+            self, level, hashes_added, hashes_removed, t1_hashtable, t2_hashtable, parents_ids, _original_type):
+        """
+        Used by partition_key_func.
+        Gets the pairs of the added and removed items that are in the same partition.
+        So the number of potential pairs that are compared only grows with the size of the partitions.
+        Gets the pairs of all the items if the partition key of an item can not be found.
+        """
+        try:
+            added_partitions = self._get_partitions(hashes_added, t2_hashtable, level)
+            removed_partitions = self._get_partitions(hashes_removed, t1_hashtable, level)
+        except CannotCompare:
+            return self._get_most_in_common_pairs_in_iterables(
+                hashes_added, hashes_removed, t1_hashtable, t2_hashtable, parents_ids, _original_type)
+        pairs = dict_()
+        for key, partition_added in added_partitions.items():
+            partition_removed = removed_partitions.get(key)
+            if partition_removed:
+                pairs.update(self._get_most_in_common_pairs_in_iterables(
+                    partition_added, partition_removed, t1_hashtable, t2_hashtable, parents_ids, _original_type))
+        return pairs
+
+    def _diff_iterable_with_deephash(self, level, parents_ids, _original_type=None, hashtables=None):
+        """
+        Diff of hashable or unhashable iterables. Only used when ignoring the order.
+        hashtables are the hashtables of t1 and t2 if they are already created.
+        """
+
+        if hashtables is None:
+            hashtables = self._create_hashtables_by_value(level)
+        if hashtables is None:
+            full_t1_hashtable = self._create_hashtable(level, 't1')
+            full_t2_hashtable = self._create_hashtable(level, 't2')
+        else:
+            full_t1_hashtable, full_t2_hashtable = hashtables
         t1_hashes = OrderedSetPlus(full_t1_hashtable.keys())
         t2_hashes = OrderedSetPlus(full_t2_hashtable.keys())
         hashes_added = t2_hashes - t1_hashes
@@ -985,8 +1595,12 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
 
         if self._stats[PASSES_COUNT] < self.max_passes and get_pairs:
             self._stats[PASSES_COUNT] += 1
-            pairs = self._get_most_in_common_pairs_in_iterables(
-                hashes_added, hashes_removed, t1_hashtable, t2_hashtable, parents_ids, _original_type)
+            if self.partition_key_func is None:
+                pairs = self._get_most_in_common_pairs_in_iterables(
+                    hashes_added, hashes_removed, t1_hashtable, t2_hashtable, parents_ids, _original_type)
+            else:
+                pairs = self._get_most_in_common_pairs_in_partitions(
+                    level, hashes_added, hashes_removed, t1_hashtable, t2_hashtable, parents_ids, _original_type)
         elif get_pairs:
             if not self._stats[MAX_PASS_LIMIT_REACHED]:
                 self._stats[MAX_PASS_LIMIT_REACHED] = True
@@ -995,6 +1609,10 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
         else:
             pairs = dict_()
 
+        # The hashes that are already reported as a pair of another hash.
+        # Removing them from the ordered sets instead would take linear time per pair.
+        paired_hashes = set()
+
         def get_other_pair(hash_value, in_t1=True):
             """
             Gets the other paired indexed hash item to the hash_value in the pairs dictionary
@@ -1002,10 +1620,8 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
             """
             if in_t1:
                 hashtable = t1_hashtable
-                the_other_hashes = hashes_removed
             else:
                 hashtable = t2_hashtable
-                the_other_hashes = hashes_added
             other = pairs.pop(hash_value, notpresent)
             if other is notpresent:
                 other = notpresent_indexed
@@ -1014,12 +1630,14 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
                 # removing the other direction of pair
                 # so it does not get used.
                 del pairs[other]
-                the_other_hashes.remove(other)
+                paired_hashes.add(other)
                 other = hashtable[other]
             return other
 
         if self.report_repetition:
             for hash_value in hashes_added:
+                if hash_value in paired_hashes:
+                    continue
                 if self._count_diff() is StopIteration:
                     return  # pragma: no cover. This is already covered for addition (when report_repetition=False).
                 other = get_other_pair(hash_value)
@@ -1035,9 +1653,10 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
                     if other.item is notpresent:
                         self._report_result('iterable_item_added', change_level)
                     else:
-                        parents_ids_added = add_to_frozen_set(parents_ids, item_id)
-                        self._diff(change_level, parents_ids_added)
+                        yield change_level, item_id
             for hash_value in hashes_removed:
+                if hash_value in paired_hashes:
+                    continue
                 if self._count_diff() is StopIteration:
                     return  # pragma: no cover. This is already covered for addition.
                 other = get_other_pair(hash_value, in_t1=False)
@@ -1054,8 +1673,7 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
                         # I was not able to make a test case for the following 2 lines since the cases end up
                         # getting resolved above in the hashes_added calcs. However I am leaving these 2 lines
                         # in case things change in future.
-                        parents_ids_added = add_to_frozen_set(parents_ids, item_id)  # pragma: no cover.
-                        self._diff(change_level, parents_ids_added)  # pragma: no cover.
+                        yield change_level, item_id  # pragma: no cover.
 
             items_intersect = t2_hashes.intersection(t1_hashes)
 
@@ -1082,6 +1700,8 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
 
         else:
             for hash_value in hashes_added:
+                if hash_value in paired_hashes:
+                    continue
                 if self._count_diff() is StopIteration:
                     return
                 other = get_other_pair(hash_value)
@@ -1095,10 +1715,11 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
                 if other.item is notpresent:
                     self._report_result('iterable_item_added', change_level)
                 else:
-                    parents_ids_added = add_to_frozen_set(parents_ids, item_id)
-                    self._diff(change_level, parents_ids_added)
+                    yield change_level, item_id
 
             for hash_value in hashes_removed:
+                if hash_value in paired_hashes:
+                    continue
                 if self._count_diff() is StopIteration:
                     return  # pragma: no cover. This is already covered for addition.
                 other = get_other_pair(hash_value, in_t1=False)
@@ -1114,8 +1735,116 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
                 else:
                     # Just like the case when report_repetition = True, these lines never run currently.
                     # However they will stay here in case things change in future.
-                    parents_ids_added = add_to_frozen_set(parents_ids, item_id)  # pragma: no cover.
-                    self._diff(change_level, parents_ids_added)  # pragma: no cover.
+                    yield change_level, item_id  # pragma: no cover.
+
+    def _get_subtree_hash(self, obj, hashes, parent):
+        """
+        Get the hash of obj. The hash is only calculated if it is not already in hashes.
+        Returns None if the object could not be fully hashed.
+        """
+        result = DeepHash.get_key(hashes, obj)
+        if result is None:
+            DeepHash(
+                obj,
+                hashes=hashes,
+                parent=parent,
+                apply_hash=True,
+                ignore_iterable_order=hashes is self.hashes,
+                **self.deephash_parameters,
+            )
+            if hashes.pop(UNPROCESSED_KEY, None):
+                return None
+            result = DeepHash.get_key(hashes, obj)
+        if result is unprocessed:
+            return None
+        return result
+
+    def _get_nan_and_children(self, obj):
+        """
+        Used by _subtree_has_nan.
+        Returns whether obj is a nan or has one that is not one of its children, and the children to check.
+        The iterables that can't be iterated more than once are considered to have a nan since they can't be checked.
+        """
+        if isinstance(obj, numbers):
+            return obj != obj and not (self.ignore_nan_inequality and isinstance(obj, float)), ()
+        if isinstance(obj, (strings, bytes_type)):
+            return False, ()
+        if isinstance(obj, Mapping):
+            return False, [*obj.keys(), *obj.values()]
+        if isinstance(obj, np_ndarray):
+            if obj.dtype.kind in 'fc':
+                return bool(np.isnan(obj).any()), ()
+            if obj.dtype.kind == 'O':
+                return False, list(obj.flat)
+            return False, ()
+        if isinstance(obj, (list, tuple, set, frozenset, deque, OrderedSet)):
+            return False, list(obj)
+        if isinstance(obj, Iterable):
+            return True, ()
+        if hasattr(obj, '__dict__'):
+            return False, list(obj.__dict__.values())
+        if hasattr(obj, '__slots__'):
+            return False, list(self._dict_from_slots(obj).values())
+        return False, ()
+
+    def _subtree_has_nan(self, obj):
+        """
+        Used by prune_equal_subtrees.
+        DeepHash gives all the nans the same hash while they are not equal to each other when they are diffed.
+        Returns True if there is a nan anywhere in obj. The results are kept along with the objects
+        so each object is only checked once.
+        The objects that are in a cycle are considered to have a nan.
+        """
+        results = self._prune_nan_results
+        children_of_pending = {}
+        stack = [obj]
+        while stack:
+            item = stack[-1]
+            item_id = id(item)
+            if item_id in results:
+                stack.pop()
+                continue
+            children = children_of_pending.get(item_id)
+            if children is None:
+                has_nan, children = self._get_nan_and_children(item)
+                if has_nan or not children:
+                    results[item_id] = (item, has_nan)
+                    stack.pop()
+                    continue
+                children_of_pending[item_id] = children
+                for child in children:
+                    child_id = id(child)
+                    if child_id in children_of_pending:
+                        # The child is an object that is still being checked which means there is a cycle.
+                        results[item_id] = (item, True)
+                        break
+                    if child_id not in results:
+                        stack.append(child)
+            else:
+                stack.pop()
+                results[item_id] = (item, any(results[id(child)][1] for child in children))
+        return results[id(obj)][1]
+
+    def _subtree_hashes_are_equal(self, level):
+        """
+        Used by prune_equal_subtrees.
+        Returns True if the hashes of t1 and t2 of a container level are the same which means
+        there is no need to go deeper in the level. The subtrees with nans are never considered equal.
+        """
+        if isinstance(level.t1, strings) or not isinstance(level.t1, Iterable):
+            return False
+        parent = level.path()
+        if parent is None:
+            return False
+        try:
+            t1_hash = self._get_subtree_hash(level.t1, self._prune_hashes, parent)
+            if t1_hash is None:
+                return False
+            t2_hash = self._get_subtree_hash(level.t2, self._prune_hashes, parent)
+        except Exception as e:  # pragma: no cover
+            logger.debug("Can not produce a hash for %s to prune. %s" % (parent, e))
+            return False
+        return t1_hash == t2_hash and not self._subtree_has_nan(level.t1) and not self._subtree_has_nan(level.t2)
 
     def _diff_booleans(self, level):
         if level.t1 != level.t2:
@@ -1178,12 +1907,22 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
 
         if not self.ignore_order_func(level):
             # fast checks
+            # The arrays of the same shape are checked chunk by chunk so that memory-mapped arrays are not
+            # loaded into the memory all at once.
             if self.significant_digits is None:
-                if np.array_equal(level.t1, level.t2):
+                if level.t1.shape == level.t2.shape and all(
+                        np.array_equal(t1_chunk, t2_chunk)
+                        for _, t1_chunk, t2_chunk in self._get_numpy_array_chunks(level.t1, level.t2)):
                     return  # all good
             else:
                 try:
-                    np.testing.assert_almost_equal(level.t1, level.t2, decimal=self.significant_digits)
+                    # The numbers that overflow when they are subtracted are not almost equal either.
+                    with np.errstate(over='ignore', invalid='ignore'):
+                        if level.t1.shape == level.t2.shape:
+                            for _, t1_chunk, t2_chunk in self._get_numpy_array_chunks(level.t1, level.t2):
+                                np.testing.assert_almost_equal(t1_chunk, t2_chunk, decimal=self.significant_digits)
+                        else:
+                            np.testing.assert_almost_equal(level.t1, level.t2, decimal=self.significant_digits)
                     return  # all good
                 except AssertionError:
                     pass    # do detailed checking below
@@ -1191,23 +1930,42 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
         # compare array meta-data
         _original_type = level.t1.dtype
         if level.t1.shape != level.t2.shape:
+            same_ndim = level.t1.ndim == level.t2.ndim
+            if same_ndim and not self.ignore_order_func(level) and self._can_diff_numpy_array_items_vectorized(level):
+                yield from self._diff_numpy_arrays_of_different_shapes(level)
+                return
             # arrays are converted to python lists so that certain features of DeepDiff can apply on them easier.
             # They will be converted back to Numpy at their final dimension.
+            t1 = level.t1
+            t2 = level.t2
             level.t1 = level.t1.tolist()
             level.t2 = level.t2.tolist()
-            self._diff_iterable(level, parents_ids, _original_type=_original_type)
+            if self.ignore_order_func(level):
+                yield from self._diff_iterable_with_deephash(
+                    level, parents_ids, _original_type=_original_type,
+                    hashtables=self._create_hashtables_of_numpy_rows(level, t1, t2))
+            else:
+                yield from self._diff_iterable(level, parents_ids, _original_type=_original_type)
         else:
             # metadata same -- the difference is in the content
             shape = level.t1.shape
             dimensions = len(shape)
-            if dimensions == 1:
-                self._diff_iterable(level, parents_ids, _original_type=_original_type)
+            if dimensions and not self.ignore_order_func(level) and self._can_diff_numpy_array_items_vectorized(level):
+                yield from self._diff_numpy_array_items_vectorized(level)
             elif self.ignore_order_func(level):
-                # arrays are converted to python lists so that certain features of DeepDiff can apply on them easier.
-                # They will be converted back to Numpy at their final dimension.
-                level.t1 = level.t1.tolist()
-                level.t2 = level.t2.tolist()
-                self._diff_iterable_with_deephash(level, parents_ids, _original_type=_original_type)
+                t1 = level.t1
+                t2 = level.t2
+                if dimensions != 1:
+                    # arrays are converted to python lists so that certain features of DeepDiff can apply
+                    # on them easier.
+                    # They will be converted back to Numpy at their final dimension.
+                    level.t1 = level.t1.tolist()
+                    level.t2 = level.t2.tolist()
+                yield from self._diff_iterable_with_deephash(
+                    level, parents_ids, _original_type=_original_type,
+                    hashtables=self._create_hashtables_of_numpy_rows(level, t1, t2))
+            elif dimensions == 1:
+                yield from self._diff_iterable(level, parents_ids, _original_type=_original_type)
             else:
                 for (t1_path, t1_row), (t2_path, t2_row) in zip(
                         get_numpy_ndarray_rows(level.t1, shape),
@@ -1219,7 +1977,194 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
                         child_relationship_class=NumpyArrayRelationship,
                         child_relationship_param=t1_path)
 
-                    self._diff_iterable_in_order(new_level, parents_ids, _original_type=_original_type)
+                    yield from self._diff_iterable_in_order(new_level, parents_ids, _original_type=_original_type)
+
+    def _can_diff_numpy_array_items_vectorized(self, level):
+        """
+        Whether the items of 2 numpy arrays of the same shape can be compared with Numpy instead of one by one.
+        The items need to be numbers or booleans of the same dtype and nothing should pair
+        or report the items in any other way than by their positions and values.
+        """
+        return all((
+            level.t1.dtype == level.t2.dtype,
+            level.t1.dtype.kind in NUMPY_VECTORIZED_DIFF_KINDS,
+            self.iterable_key_func is None,
+            self.iterable_compare_func is None,
+            self.iterable_alignment != 'lcs',
+            not self.custom_operators,
+        ))
+
+    def _get_numpy_array_chunks(self, t1, t2):
+        """
+        Split 2 numpy arrays of the same length into the chunks of their rows that take up to numpy_chunk_size bytes.
+        Yields the index of the first row of each chunk and the chunks of both arrays.
+        The chunks are views so only the chunk that is compared needs to be in the memory when the arrays are
+        memory-mapped, and the temporary arrays of the comparison are bounded by the size of the chunk too.
+        """
+        if not t1.ndim:
+            yield 0, t1, t2
+            return
+        row_size = max(t1.itemsize, t2.itemsize) * int(np.prod(t1.shape[1:]))
+        rows_per_chunk = max(1, self.numpy_chunk_size // max(row_size, 1))
+        for start in range(0, len(t1), rows_per_chunk):
+            yield start, t1[start: start + rows_per_chunk], t2[start: start + rows_per_chunk]
+
+    def _get_numpy_array_changed_indexes(self, t1, t2):
+        """
+        Get the flat indexes of the items of 2 numpy arrays of the same shape and dtype that might have changed.
+        Yields an array of the indexes per chunk of the arrays, in order.
+        """
+        row_length = int(np.prod(t1.shape[1:]))
+        for start, t1_chunk, t2_chunk in self._get_numpy_array_chunks(t1, t2):
+            indexes = self._get_numpy_chunk_changed_indexes(t1_chunk, t2_chunk)
+            if len(indexes):
+                yield indexes + start * row_length
+
+    def _get_numpy_chunk_changed_indexes(self, t1, t2):
+        """
+        Get the flat indexes of the items of 2 numpy arrays of the same shape and dtype that might have changed.
+        The items that are left out are the same for sure. The rest still go through the regular diff of numbers
+        so that they are reported exactly the same way as when the arrays are diffed item by item.
+        """
+        t1 = t1.ravel()
+        t2 = t2.ravel()
+        # The nans are never equal here. Whether they are reported is decided by the regular diff.
+        indexes = np.flatnonzero(t1 != t2)
+        if t1.dtype.kind != 'f' or t1.dtype.itemsize > 8 or not len(indexes):
+            return indexes
+        x = t1[indexes].astype(np.float64)
+        y = t2[indexes].astype(np.float64)
+        # The numbers that overflow to inf or end up as nan are never the same here.
+        # So they are left for the regular diff.
+        formats_numbers_like_python = self.number_to_string is number_to_string and self.number_format_notation == 'f'
+        with np.errstate(over='ignore', invalid='ignore'):
+            if self.math_epsilon is not None:
+                # math.isclose considers the numbers close when their difference is within abs_tol
+                # regardless of rel_tol.
+                same = np.abs(x - y) <= self.math_epsilon
+            elif self.significant_digits is not None and self.significant_digits <= 15 and formats_numbers_like_python:
+                # The numbers are formatted the same when they are rounded to the same integer after being scaled.
+                # Python rounds the exact binary value of the number while the scaling here is rounded too.
+                # So the numbers that are too close to a tie after being scaled are left for the regular diff.
+                scale = 10.0 ** self.significant_digits
+                x *= scale
+                y *= scale
+                rounded_x = np.rint(x)
+                rounded_y = np.rint(y)
+                same = rounded_x == rounded_y
+                same &= np.abs(np.abs(x - rounded_x) - 0.5) > np.abs(x) * 2.0 ** -50
+                same &= np.abs(np.abs(y - rounded_y) - 0.5) > np.abs(y) * 2.0 ** -50
+            else:
+                return indexes
+        return indexes[~same]
+
+    def _diff_numpy_array_items_vectorized(self, level):
+        """
+        Diff the items of 2 numpy arrays of the same shape and dtype in place of diffing them row by row.
+        The child levels are only created for the items that might have changed and they are the same levels
+        that the rows of the arrays would create for them.
+        """
+        t1 = level.t1
+        t2 = level.t2
+        coordinates = (
+            coordinates
+            for indexes in self._get_numpy_array_changed_indexes(t1, t2)
+            for coordinates in np.stack(np.unravel_index(indexes, t1.shape), axis=-1).tolist())
+        row_path = row_level = None
+        for *path, i in coordinates:
+            path = tuple(path)
+            if path != row_path:
+                row_path = path
+                # The items of 1 dimensional arrays are the children of the arrays themselves.
+                row_level = level.branch_deeper(
+                    t1[path],
+                    t2[path],
+                    child_relationship_class=NumpyArrayRelationship,
+                    child_relationship_param=path) if path else level
+            if self._count_diff() is StopIteration:
+                return  # pragma: no cover. This is already covered for addition.
+            x = row_level.t1[i]
+            next_level = row_level.branch_deeper(
+                x,
+                row_level.t2[i],
+                child_relationship_class=SubscriptableIterableRelationship,
+                child_relationship_param=i)
+            yield next_level, id(x)
+
+    def _diff_numpy_arrays_of_different_shapes(self, level):
+        """
+        Diff 2 numpy arrays with the same number of dimensions but different shapes without converting them to lists.
+        The part that both arrays have is compared with Numpy. The slices that only one of them has are reported
+        as removed or added the same way as when the nested lists of the arrays are diffed in order.
+        The changes are reported in the same order as that diff too, which is depth first.
+        """
+        t1 = level.t1
+        t2 = level.t2
+        common_shape = tuple(map(min, t1.shape, t2.shape))
+        common_slices = tuple(slice(0, length) for length in common_shape)
+        changed_items = (
+            (tuple(coordinates), None)
+            for indexes in self._get_numpy_array_changed_indexes(t1[common_slices], t2[common_slices])
+            for coordinates in np.stack(np.unravel_index(indexes, common_shape), axis=-1).tolist())
+        last_axis = max(axis for axis, length in enumerate(common_shape) if t1.shape[axis] != t2.shape[axis])
+
+        def get_extra_slices(path, axis):
+            length = common_shape[axis]
+            if axis < last_axis:
+                for i in range(length):
+                    yield from get_extra_slices(path + (i, ), axis + 1)
+            if t1.shape[axis] > length:
+                for i in range(length, t1.shape[axis]):
+                    yield path + (i, ), 'iterable_item_removed'
+            else:
+                for i in range(length, t2.shape[axis]):
+                    yield path + (i, ), 'iterable_item_added'
+
+        # The levels from the top level down to the row of the current change.
+        levels = [level]
+        current_row_path = ()
+        for path, report_type in heapq.merge(changed_items, get_extra_slices((), 0)):
+            if self._count_diff() is StopIteration:
+                return  # pragma: no cover. This is already covered for addition.
+            row_path, i = path[:-1], path[-1]
+            if row_path != current_row_path:
+                depth = 0
+                for index, current_index in zip(row_path, current_row_path):
+                    if index != current_index:
+                        break
+                    depth += 1
+                del levels[depth + 1:]
+                current_row_path = row_path
+            for index in row_path[len(levels) - 1:]:
+                up = levels[-1]
+                levels.append(up.branch_deeper(
+                    up.t1[index],
+                    up.t2[index],
+                    child_relationship_class=SubscriptableIterableRelationship,
+                    child_relationship_param=index))
+            row_level = levels[-1]
+            if report_type is None:
+                x = row_level.t1[i].item()
+                next_level = row_level.branch_deeper(
+                    x,
+                    row_level.t2[i].item(),
+                    child_relationship_class=SubscriptableIterableRelationship,
+                    child_relationship_param=i)
+                yield next_level, id(x)
+            elif report_type == 'iterable_item_removed':
+                change_level = row_level.branch_deeper(
+                    row_level.t1[i].tolist(),
+                    notpresent,
+                    child_relationship_class=SubscriptableIterableRelationship,
+                    child_relationship_param=i)
+                self._report_result(report_type, change_level)
+            else:
+                change_level = row_level.branch_deeper(
+                    notpresent,
+                    row_level.t2[i].tolist(),
+                    child_relationship_class=SubscriptableIterableRelationship,
+                    child_relationship_param=i)
+                self._report_result(report_type, change_level)
 
     def _diff_types(self, level):
         """Diff types"""
@@ -1280,7 +2225,7 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
 
         return False
 
-    def _diff(self, level, parents_ids=frozenset(), _original_type=None):
+    def _iter_diff(self, level, parents_ids=frozenset(), _original_type=None):
         """
         The main diff method
 
@@ -1289,6 +2234,49 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
         level: the tree level or tree node
         parents_ids: the ids of all the parent objects in the tree from the current node.
         _original_type: If the objects had an original type that was different than what currently exists in the level.t1 and t2
+
+        The objects are traversed with an explicit stack instead of recursion so there is no limit on how deeply
+        nested they can be. The diff methods of containers are generators of the child levels that need to be diffed.
+        The stack keeps one of those generators per level of depth and parents_ids is a set that is
+        updated as levels are pushed to and popped from the stack.
+        This method is a generator itself. When the changes are streamed, it yields after every level that
+        has reported changes and after every level that is fully diffed so that they can be consumed.
+        Otherwise it does not yield anything.
+        """
+        parents_ids = set(parents_ids)
+        stream_changes = self._stream_changes
+        children = self._diff_one_level(level, parents_ids, _original_type=_original_type)
+        if stream_changes and self.tree:
+            yield
+        if children is None:
+            return
+        stack = [(children, None)]
+        while stack:
+            children, item_id = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                parents_ids.discard(item_id)
+                # The changes that were held until this level was fully diffed can be consumed now.
+                if stream_changes and self.tree:
+                    yield
+                continue
+            next_level, item_id = child
+            children = self._diff_one_level(next_level, parents_ids)
+            if stream_changes and self.tree:
+                yield
+            if children is not None:
+                if item_id in parents_ids:
+                    item_id = None
+                else:
+                    parents_ids.add(item_id)
+                stack.append((children, item_id))
+
+    def _diff_one_level(self, level, parents_ids, _original_type=None):
+        """
+        Diff the level without going deeper.
+        Returns None if the objects in the level are fully diffed.
+        Otherwise returns the generator of the child levels that need to be diffed.
         """
         if self._count_diff() is StopIteration:
             return
@@ -1299,6 +2287,9 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
         if level.t1 is level.t2:
             return
 
+        if self._use_native_equality and _is_natively_equal(level.t1, level.t2):
+            return
+
         if self._skip_this(level):
             return
 
@@ -1319,45 +2310,18 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
         if self.ignore_nan_inequality and isinstance(level.t1, float) and str(level.t1) == str(level.t2) == 'nan':
             return
 
-        if isinstance(level.t1, booleans):
-            self._diff_booleans(level)
-
-        if isinstance(level.t1, strings):
-            self._diff_str(level)
-
-        elif isinstance(level.t1, times):
-            self._diff_datetimes(level)
-
-        elif isinstance(level.t1, uuids):
-            self._diff_uuids(level)
-
-        elif isinstance(level.t1, numbers):
-            self._diff_numbers(level)
-
-        elif isinstance(level.t1, Mapping):
-            self._diff_dict(level, parents_ids)
-
-        elif isinstance(level.t1, tuple):
-            self._diff_tuple(level, parents_ids)
-
-        elif isinstance(level.t1, (set, frozenset, OrderedSet)):
-            self._diff_set(level)
-
-        elif isinstance(level.t1, np_ndarray):
-            self._diff_numpy_array(level, parents_ids)
+        if self.prune_equal_subtrees and self._subtree_hashes_are_equal(level):
+            return
 
-        elif isinstance(level.t1, Iterable):
-            self._diff_iterable(level, parents_ids, _original_type=_original_type)
-
-        else:
-            self._diff_obj(level, parents_ids)
+        diff_method = self._diff_methods.get(type(level.t1)) or self._diff_methods.get_handler(level.t1)
+        return diff_method(self, level, parents_ids, _original_type)
 
     def _get_view_results(self, view):
         """
         Get the results based on the view
         """
         result = self.tree
-        if not self.report_repetition:  # and self.is_root:
+        if self._merge_mutual_add_removes:  # and self.is_root:
             result.mutual_add_removes_to_become_value_changes()
         if view == TREE_VIEW:
             pass
@@ -1402,6 +2366,53 @@ class DeepDiff(ResultDict, SerializationMixin, DistanceMixin, Base):
         return self._stats
 
 
+def iter_diff(t1, t2, **kwargs):
+    """
+    Diff t1 and t2 just like DeepDiff does but yield the changes as they are found instead of building the results.
+    It takes the same parameters as DeepDiff except the ones that are about the results.
+    Passing view raises a ValueError and get_deep_distance is ignored.
+
+    Each change is a tuple of (report_type, path, old, new). The old or the new value is notpresent when
+    the item does not exist on that side. Changes are not kept after they are yielded and call close() on
+    the generator to stop diffing early. So when the order is not ignored, the memory use only depends on
+    how deep the objects are. The changes of an iterable that ignores the order are held until
+    the whole iterable is diffed so that they are the same as the ones DeepDiff reports.
+
+        >>> from deepdiff import iter_diff
+        >>> for change in iter_diff({'a': 1, 'b': [1, 2]}, {'a': 2, 'b': [1, 2, 3]}):
+        ...     print(change)
+        ('values_changed', "root['a']", 1, 2)
+        ('iterable_item_added', "root['b'][2]", not present, 3)
+    """
+    if 'view' in kwargs:
+        raise ValueError(ITER_DIFF_VIEW_MSG)
+    return DeepDiff(t1, t2, view=TREE_VIEW, _stream_changes=True, **kwargs)._changes
+
+
+def deep_equal(t1, t2, **kwargs):
+    """
+    Whether there is no difference between t1 and t2. It takes the same parameters as DeepDiff
+    such as ignore_order, significant_digits or exclude_paths but stops diffing at the first difference
+    instead of calculating the whole diff. Items that are only moved are not considered a difference.
+
+        >>> from deepdiff import deep_equal
+        >>> deep_equal([1, 2, 3], [3, 2, 1], ignore_order=True)
+        True
+        >>> deep_equal({'a': 1.0001}, {'a': 1.0002}, significant_digits=2)
+        True
+        >>> deep_equal({'a': [1, 2]}, {'a': [1, 3]})
+        False
+    """
+    changes = iter_diff(t1, t2, **kwargs)
+    try:
+        for report_type, _, _, _ in changes:
+            if report_type != 'iterable_item_moved':
+                return False
+        return True
+    finally:
+        changes.close()
+
+
 if __name__ == "__main__":  # pragma: no cover
     import doctest
     doctest.testmod()
@@ -1,14 +1,44 @@
 import datetime
+from zlib import crc32
 from deepdiff.deephash import DeepHash
 from deepdiff.helper import (
     DELTA_VIEW, numbers, strings, add_to_frozen_set, not_found, only_numbers, np, np_float64, time_to_seconds,
-    cartesian_product_numpy, np_ndarray, np_array_factory, get_homogeneous_numpy_compatible_type_of_seq, dict_,
+    np_ndarray, np_array_factory, get_homogeneous_numpy_compatible_type_of_seq, dict_,
     CannotCompare)
+from deepdiff.model import get_delta_type_change
+from collections import defaultdict
+from itertools import chain
 from collections.abc import Mapping, Iterable
 
 
 DISTANCE_CALCS_NEEDS_CACHE = "Distance calculation can not happen once the cache is purged. Try with _cache='keep'"
 
+# The number of MinHash values that make up each band of the locality sensitive hashing.
+# Only the items that have all the values of at least one band in common become candidates to be pairs.
+LSH_ROWS_PER_BAND = 3
+LSH_SEED = 1729
+
+# Roughly how many bytes the arrays that are used to calculate the distance of each pair of numbers or records take.
+NUMPY_DISTANCE_BYTES_PER_PAIR = 64
+
+# The types of the values of the records whose distances can be calculated in columns.
+# The values of these types are different only when they are not equal.
+RECORD_VALUE_TYPES = frozenset({str, bytes, int, float, bool, type(None)})
+
+# The reports that put the new value or the old value in the delta.
+REPORT_TYPES_OF_NEW_VALUES = frozenset({
+    'values_changed', 'iterable_item_added', 'dictionary_item_added', 'attribute_added', 'set_item_added'})
+REPORT_TYPES_OF_OLD_VALUES = frozenset({
+    'iterable_item_removed', 'dictionary_item_removed', 'attribute_removed', 'set_item_removed'})
+
+
+class DiffLengthLimitReached(Exception):
+    """
+    Raised when the diff that is only run to get the rough distance of 2 objects
+    finds enough changes that the objects can't be pairs.
+    """
+    pass
+
 
 class DistanceMixin:
 
@@ -36,8 +66,11 @@ class DistanceMixin:
         if _distance is not not_found:
             return _distance
 
-        item = self if self.view == DELTA_VIEW else self._to_delta_dict(report_repetition_required=False)
-        diff_length = _get_item_length(item)
+        if self._max_diff_length is not None:
+            diff_length = self._diff_length
+        else:
+            item = self if self.view == DELTA_VIEW else self._to_delta_dict(report_repetition_required=False)
+            diff_length = _get_item_length(item)
 
         if diff_length == 0:
             return 0
@@ -47,6 +80,66 @@ class DistanceMixin:
 
         return diff_length / (t1_len + t2_len)
 
+    def _get_max_diff_length_for_pairs(self, t1, t2):
+        """
+        Get the diff length at which the rough distance of t1 and t2 reaches cutoff_distance_for_pairs
+        so the diff that is run to get their distance can stop there.
+        Returns None if the distance of t1 and t2 is not based on the diff length.
+        """
+        if get_numeric_types_distance(t1, t2, max_=self.cutoff_distance_for_pairs) is not not_found:
+            return None
+        return self.cutoff_distance_for_pairs * (
+            self.__get_item_rough_length(t1) + self.__get_item_rough_length(t2))
+
+    def _count_diff_length(self, report_type, level):
+        """
+        Used by the diffs that are only run to get the rough distance of the potential pairs.
+        Adds the number of operations that the report adds to the delta to the length of the diff
+        so that neither the results nor the delta need to be built.
+        Raises DiffLengthLimitReached once the diff is too long for t1 and t2 to be pairs.
+        """
+        if self.ignore_order and report_type in {'iterable_item_added', 'iterable_item_removed', 'repetition_change'}:
+            # Just like in the delta, the same object is only counted once per iterable.
+            value = level.t2 if report_type == 'iterable_item_added' else level.t1
+            key = (report_type == 'iterable_item_removed', id(level.up), id(value))
+            if key in self._counted_reports:
+                return
+            self._counted_reports.add(key)
+
+        if report_type in REPORT_TYPES_OF_NEW_VALUES:
+            if report_type == 'iterable_item_added' and self._merge_mutual_add_removes:
+                self.tree[report_type].add(level)
+            self._diff_length += _get_item_length(level.t2)
+        elif report_type in REPORT_TYPES_OF_OLD_VALUES:
+            if report_type == 'iterable_item_removed' and self._merge_mutual_add_removes:
+                # A removed item and an added item at the same path become a value change
+                # that only has the new value. So the removed items are counted once the diff is done.
+                self.tree[report_type].add(level)
+            else:
+                self._diff_length += _get_item_length(level.t1)
+        elif report_type == 'type_changes':
+            old_type, new_type, include_values = get_delta_type_change(level.t1, level.t2)
+            self._diff_length += _get_item_length(old_type) + _get_item_length(new_type)
+            if include_values:
+                self._diff_length += _get_item_length(level.t2)
+        elif report_type == 'repetition_change':
+            self._diff_length += _get_item_length(level.t1)
+        elif report_type == 'iterable_item_moved' and not self.ignore_order:
+            # The new path and the value
+            self._diff_length += 1 + _get_item_length(level.t2)
+        if self._diff_length >= self._max_diff_length:
+            raise DiffLengthLimitReached()
+
+    def _count_removed_items_length(self):
+        """
+        Add the length of the removed items that did not become value changes to the length of the diff.
+        """
+        tree = self.tree
+        if 'iterable_item_removed' in tree:
+            tree.mutual_add_removes_to_become_value_changes()
+            for level in tree.get('iterable_item_removed', ()):
+                self._diff_length += _get_item_length(level.t1)
+
     def __get_item_rough_length(self, item, parent='root'):
         """
         Get the rough length of an item.
@@ -94,14 +187,65 @@ class DistanceMixin:
 
         return pre_calced_distances
 
+    def _get_lsh_candidates(self, hashes_added, hashes_removed, t1_hashtable, t2_hashtable):
+        """
+        Used by lsh_bands_for_pairs.
+        Gets the removed items that are likely to be similar to each added item using MinHash
+        on the leaves of the items.
+        The items that end up in the same bucket of any band are the candidates. All of them are kept and
+        the distances decide the pairs so the more bands, the fewer similar items are missed.
+        Returns a dictionary of added hash to a list of removed hashes that are candidates to be its pair
+        or None if any of the items is not a container.
+        """
+        features_of_items = []
+        for hashes, hashtable in ((hashes_added, t2_hashtable), (hashes_removed, t1_hashtable)):
+            for item_hash in hashes:
+                features = _get_leaf_features(hashtable[item_hash].item, self.hashes)
+                if features is None:
+                    return None
+                features_of_items.append(features)
+
+        bands = self.lsh_bands_for_pairs
+        item_indexes, signatures = _get_minhash_signatures(features_of_items, bands * LSH_ROWS_PER_BAND)
+        added_len = len(hashes_added)
+        candidate_pairs = set()
+        for band in range(bands):
+            band_signatures = signatures[:, band * LSH_ROWS_PER_BAND: (band + 1) * LSH_ROWS_PER_BAND]
+            buckets = defaultdict(list)
+            for row, key in enumerate(map(bytes, band_signatures)):
+                buckets[key].append(row)
+            for rows in buckets.values():
+                if len(rows) < 2:
+                    continue
+                added_rows = [row for row in rows if item_indexes[row] < added_len]
+                removed_rows = [row for row in rows if item_indexes[row] >= added_len]
+                for added_row in added_rows:
+                    for removed_row in removed_rows:
+                        candidate_pairs.add((added_row, removed_row))
+
+        hashes_added = list(hashes_added)
+        hashes_removed = list(hashes_removed)
+        candidates = defaultdict(list)
+        for added_row, removed_row in sorted(candidate_pairs):
+            candidates[hashes_added[item_indexes[added_row]]].append(
+                hashes_removed[item_indexes[removed_row] - added_len])
+        return candidates
+
     def _precalculate_numpy_arrays_distance(
             self, hashes_added, hashes_removed, t1_hashtable, t2_hashtable, _original_type):
+        """
+        Calculate the distances of the added and the removed numbers with Numpy.
+        The distances are calculated for blocks of the added numbers at a time
+        so that the arrays that are used stay within memory_budget_for_pairs.
+        Returns a dictionary of added hash to the list of (removed hash, distance) of the removed numbers that are
+        close enough to be its pairs, only the closest max_candidates_for_pairs of them if it is set.
+        Returns None if the items are not numbers.
+        """
 
         # We only want to deal with 1D arrays.
         if isinstance(t2_hashtable[hashes_added[0]].item, (np_ndarray, list)):
             return
 
-        pre_calced_distances = dict_()
         added = [t2_hashtable[k].item for k in hashes_added]
         removed = [t1_hashtable[k].item for k in hashes_removed]
 
@@ -115,21 +259,274 @@ class DistanceMixin:
 
         added = np_array_factory(added, dtype=_original_type)
         removed = np_array_factory(removed, dtype=_original_type)
+        cutoff = self.cutoff_distance_for_pairs
 
-        pairs = cartesian_product_numpy(added, removed)
+        def get_distances(start, stop):
+            return _get_numpy_array_distance(added[start: stop, None], removed[None, :], max_=cutoff)
 
-        pairs_transposed = pairs.T
+        return self._get_distances_of_pairs_in_blocks(hashes_added, hashes_removed, get_distances)
 
-        distances = _get_numpy_array_distance(
-            pairs_transposed[0], pairs_transposed[1],
-            max_=self.cutoff_distance_for_pairs)
+    def _precalculate_records_distance(
+            self, hashes_added, hashes_removed, t1_hashtable, t2_hashtable, _original_type):
+        """
+        Calculate the distances of the added and the removed records with Numpy.
+        Records are dictionaries that all have the same keys where the values of each key are of the same type
+        and are compared by equality, such as strings and numbers.
+        The values of each key are turned into a column of codes where only the equal values get the same code.
+        The number of operations to convert one record to another is the number of columns where their codes differ.
+        Returns the same dictionary as _precalculate_numpy_arrays_distance.
+        Returns None if the items are not such records or the parameters change how the values are compared.
+        """
+        if any((
+            _original_type is not None, self.custom_operators, self.exclude_paths, self.include_paths,
+            self.exclude_regex_paths, self.exclude_types_tuple, self.exclude_obj_callback,
+            self.ignore_string_case, self.ignore_string_type_changes, self.ignore_numeric_type_changes,
+            self.ignore_nan_inequality, self.significant_digits is not None,
+            self.math_epsilon is not None, self.max_diffs is not None,
+        )):
+            return
 
-        i = 0
-        for added_hash in hashes_added:
-            for removed_hash in hashes_removed:
-                pre_calced_distances["{}--{}".format(added_hash, removed_hash)] = distances[i]
-                i += 1
-        return pre_calced_distances
+        added = [t2_hashtable[k].item for k in hashes_added]
+        removed = [t1_hashtable[k].item for k in hashes_removed]
+        keys = added[0].keys() if type(added[0]) is dict else None
+        if keys is None or any(type(item) is not dict or item.keys() != keys for item in chain(added, removed)):
+            return
+
+        columns = []
+        for key in keys:
+            if self.ignore_private_variables and isinstance(key, str) and key.startswith('__'):
+                continue
+            value_type = type(added[0][key])
+            if value_type not in RECORD_VALUE_TYPES:
+                return
+            # The equal values get the same code. A nan is only equal to itself here,
+            # just like in the diff that does not compare an object to itself.
+            codes = {}
+            added_codes = []
+            removed_codes = []
+            for items, item_codes in ((added, added_codes), (removed, removed_codes)):
+                for item in items:
+                    value = item[key]
+                    if type(value) is not value_type:
+                        return
+                    item_codes.append(codes.setdefault(value, len(codes)))
+            if len(codes) > 1:
+                columns.append((np.array(added_codes), np.array(removed_codes)))
+
+        added_lengths = np.array([self.__get_item_rough_length(item) for item in added])
+        removed_lengths = np.array([self.__get_item_rough_length(item) for item in removed])
+
+        def get_distances(start, stop):
+            lengths = added_lengths[start: stop, None] + removed_lengths[None, :]
+            diff_lengths = np.zeros(lengths.shape, dtype=np.int64)
+            for added_codes, removed_codes in columns:
+                diff_lengths += added_codes[start: stop, None] != removed_codes[None, :]
+            return diff_lengths / lengths
+
+        return self._get_distances_of_pairs_in_blocks(hashes_added, hashes_removed, get_distances)
+
+    def _get_distances_of_pairs_in_blocks(self, hashes_added, hashes_removed, get_distances):
+        """
+        Get the distances of the added and the removed items for blocks of the added items at a time
+        so that the arrays that are used stay within memory_budget_for_pairs.
+        get_distances(start, stop) returns the array of the distances of the added items from start to stop
+        to all the removed items.
+        Returns a dictionary of added hash to the list of (removed hash, distance) of the removed items that are
+        close enough to be its pairs, only the closest max_candidates_for_pairs of them if it is set.
+        """
+        hashes_added = list(hashes_added)
+        hashes_removed = list(hashes_removed)
+        cutoff = self.cutoff_distance_for_pairs
+        max_candidates = self.max_candidates_for_pairs
+        if max_candidates and max_candidates >= len(hashes_removed):
+            max_candidates = None
+        block_size = max(1, self.memory_budget_for_pairs // (len(hashes_removed) * NUMPY_DISTANCE_BYTES_PER_PAIR))
+
+        distances_of_pairs = dict_()
+        for start in range(0, len(hashes_added), block_size):
+            distances = get_distances(start, start + block_size)
+            # Discard potential pairs that are too far.
+            is_candidate = ~(distances >= cutoff)
+            if max_candidates:
+                closest = np.argpartition(distances, max_candidates - 1, axis=1)[:, :max_candidates]
+                is_closest = np.zeros_like(is_candidate)
+                np.put_along_axis(is_closest, closest, True, axis=1)
+                is_candidate &= is_closest
+            rows, columns = np.nonzero(is_candidate)
+            for row, column, distance in zip(
+                    rows.tolist(), columns.tolist(), distances[rows, columns].tolist()):
+                added_hash = hashes_added[start + row]
+                if added_hash not in distances_of_pairs:
+                    distances_of_pairs[added_hash] = []
+                distances_of_pairs[added_hash].append((hashes_removed[column], distance))
+        return distances_of_pairs
+
+    def _get_optimal_pairs(self, most_in_common_pairs):
+        """
+        Get the pairs of the added and the removed items that pair as many items as possible
+        with the smallest total distance.
+        most_in_common_pairs is the dictionary of each added hash to the distances to the removed hashes
+        that can be its pairs.
+        The items are split into groups that are connected by the potential pairs and each group is solved on its own
+        since an item can't be paired with an item of another group.
+        Returns a dictionary of added hash to removed hash.
+        """
+        neighbours = defaultdict(list)
+        distances = dict_()
+        for added_hash, distances_to_removed_hashes in most_in_common_pairs.items():
+            for distance, removed_hashes in distances_to_removed_hashes.items():
+                for removed_hash in removed_hashes:
+                    neighbours[added_hash].append(removed_hash)
+                    neighbours[removed_hash].append(added_hash)
+                    distances[added_hash, removed_hash] = distance
+
+        pairs = dict_()
+        seen = set()
+        for first_hash in most_in_common_pairs:
+            if first_hash in seen or first_hash not in neighbours:
+                continue
+            seen.add(first_hash)
+            group_added = []
+            group_removed = []
+            stack = [(first_hash, True)]
+            while stack:
+                hash_, is_added = stack.pop()
+                (group_added if is_added else group_removed).append(hash_)
+                for other_hash in neighbours[hash_]:
+                    if other_hash not in seen:
+                        seen.add(other_hash)
+                        stack.append((other_hash, not is_added))
+
+            # The cost of the items that are not potential pairs is more than the total distance of
+            # any pairs since each distance is less than 1. So the most items get paired.
+            not_pairs_cost = float(min(len(group_added), len(group_removed)) + 1)
+            costs = np.full((len(group_added), len(group_removed)), not_pairs_cost)
+            removed_indexes = {removed_hash: i for i, removed_hash in enumerate(group_removed)}
+            for i, added_hash in enumerate(group_added):
+                for removed_hash in neighbours[added_hash]:
+                    costs[i, removed_indexes[removed_hash]] = distances[added_hash, removed_hash]
+            if len(group_added) <= len(group_removed):
+                assignment = enumerate(_get_min_cost_assignment(costs).tolist())
+            else:
+                assignment = ((i, j) for j, i in enumerate(_get_min_cost_assignment(costs.T).tolist()))
+            for i, j in assignment:
+                if costs[i, j] < not_pairs_cost:
+                    pairs[group_added[i]] = group_removed[j]
+        return pairs
+
+
+def _get_leaf_features(item, hashes):
+    """
+    Get the features of an item to be used for MinHash.
+    Each feature is the hash of a leaf of the item combined with the path to the leaf.
+    The indexes of iterables are left out of the paths since the order of their items does not matter.
+    The hashes of the leaves are looked up from the hashes that DeepHash has already calculated.
+    Returns None if the item is not a container.
+    """
+    if isinstance(item, (strings, numbers, np_ndarray)) or not (
+            isinstance(item, Iterable) or hasattr(item, '__dict__')) or isinstance(item, type):
+        return None
+    features = set()
+    seen_ids = set()
+    stack = [('', item)]
+    while stack:
+        path, obj = stack.pop()
+        if isinstance(obj, (strings, numbers, np_ndarray)) or isinstance(obj, type):
+            children = None
+        elif isinstance(obj, Mapping):
+            children = [("{}[{!r}]".format(path, key), value) for key, value in obj.items()]
+        elif isinstance(obj, Iterable):
+            path = "{}[]".format(path)
+            children = [(path, value) for value in obj]
+        elif hasattr(obj, '__dict__'):
+            children = [("{}.{}".format(path, key), value) for key, value in obj.__dict__.items()]
+        else:
+            children = None
+        if children is None:
+            leaf_hash = DeepHash.get_key(hashes, obj)
+            if leaf_hash is not None:
+                features.add(crc32("{}{}".format(path, leaf_hash).encode('utf-8')))
+        elif id(obj) not in seen_ids:
+            seen_ids.add(id(obj))
+            stack.extend(children)
+    return features
+
+
+def _get_minhash_signatures(features_of_items, num_hashes):
+    """
+    Get the MinHash signatures of the items.
+    Returns the indexes of the items that have any features and a 2D array of their signatures
+    with one row per item and num_hashes columns.
+    """
+    random_state = np.random.RandomState(LSH_SEED)
+    # Odd multipliers for multiply-shift hashing. The products overflow which is the same as mod 2**64.
+    multipliers = random_state.randint(1, 2**63, size=num_hashes, dtype=np.uint64) | np.uint64(1)
+    increments = random_state.randint(1, 2**63, size=num_hashes, dtype=np.uint64)
+
+    item_indexes = []
+    offsets = []
+    flat_features = []
+    for i, features in enumerate(features_of_items):
+        if features:
+            item_indexes.append(i)
+            offsets.append(len(flat_features))
+            flat_features.extend(features)
+    signatures = np.empty((len(item_indexes), num_hashes), dtype=np.uint64)
+    if item_indexes:
+        flat_features = np.array(flat_features, dtype=np.uint64)
+        offsets = np.array(offsets)
+        shift = np.uint64(32)
+        for k in range(num_hashes):
+            hashed = (flat_features * multipliers[k] + increments[k]) >> shift
+            signatures[:, k] = np.minimum.reduceat(hashed, offsets)
+    return item_indexes, signatures
+
+
+def _get_min_cost_assignment(costs):
+    """
+    Assign a different column to each row of the costs matrix so that the total cost is the smallest.
+    The matrix can't have more rows than columns.
+    It is the Hungarian algorithm that adds one row at a time by finding the shortest augmenting path
+    where each step of the path is vectorized over the columns.
+    Returns the array of the assigned column of each row.
+    """
+    rows, columns = costs.shape
+    # The potentials of the rows and the columns and the row that is assigned to each column.
+    # They are indexed from 1 so that column 0 can hold the row that is being added.
+    row_potentials = np.zeros(rows + 1)
+    column_potentials = np.zeros(columns + 1)
+    row_of_column = np.zeros(columns + 1, dtype=np.int64)
+    previous_columns = np.zeros(columns + 1, dtype=np.int64)
+    for row in range(1, rows + 1):
+        row_of_column[0] = row
+        column = 0
+        min_reduced_costs = np.full(columns + 1, np.inf)
+        used = np.zeros(columns + 1, dtype=bool)
+        while True:
+            used[column] = True
+            current_row = row_of_column[column]
+            reduced_costs = costs[current_row - 1] - row_potentials[current_row] - column_potentials[1:]
+            free = ~used[1:]
+            improved = free & (reduced_costs < min_reduced_costs[1:])
+            min_reduced_costs[1:][improved] = reduced_costs[improved]
+            previous_columns[1:][improved] = column
+            next_column = int(np.argmin(np.where(free, min_reduced_costs[1:], np.inf))) + 1
+            delta = min_reduced_costs[next_column]
+            row_potentials[row_of_column[used]] += delta
+            column_potentials[used] -= delta
+            min_reduced_costs[1:][free] -= delta
+            column = next_column
+            if row_of_column[column] == 0:
+                break
+        # Shift the assignments along the path.
+        while column:
+            previous_column = previous_columns[column]
+            row_of_column[column] = row_of_column[previous_column]
+            column = previous_column
+    assignment = np.empty(rows, dtype=np.int64)
+    assigned_columns = np.nonzero(row_of_column[1:])[0]
+    assignment[row_of_column[1:][assigned_columns] - 1] = assigned_columns
+    return assignment
 
 
 def _get_item_length(item, parents_ids=frozenset([])):
@@ -6,6 +6,7 @@ import uuid
 import logging
 import warnings
 import time
+from abc import get_cache_token
 from ast import literal_eval
 from decimal import Decimal, localcontext
 from collections import namedtuple, OrderedDict
@@ -432,6 +433,39 @@ class OrderedSetPlus(OrderedSet):
     __str__ = __repr__
 
 
+class TypeDispatchCache(dict):
+    """
+    A dictionary of types to the handlers of objects of those types.
+    The handler of each type is found only once by calling find_handler with the first object of that type
+    so that the chain of isinstance checks does not need to run for every object.
+
+    Usage:
+        handler = cache.get(type(obj)) or cache.get_handler(obj)
+    """
+
+    def __init__(self, find_handler):
+        super().__init__()
+        self.find_handler = find_handler
+        self.cache_token = get_cache_token()
+
+    def get_handler(self, obj):
+        handler = self.find_handler(obj)
+        # Proxy objects can pretend to be of another class so their handlers are not cached.
+        if obj.__class__ is type(obj):
+            self[type(obj)] = handler
+        return handler
+
+    def refresh(self):
+        """
+        The result of isinstance checks against abstract base classes can change when a class gets registered
+        with them. So the cache needs to be cleared when the abc's cache token changes.
+        """
+        token = get_cache_token()
+        if token != self.cache_token:
+            self.clear()
+            self.cache_token = token
+
+
 class RepeatedTimer:
     """
     Threaded Repeated Timer by MestreLion
@@ -302,6 +302,8 @@ class DeltaResult(TextResult):
         :param tree: A TreeResult
         :return:
         """
+        if tree.get('iterable_item_moved'):
+            tree = self._get_tree_without_changes_inside_moved_items(tree)
         self._from_tree_type_changes(tree)
         self._from_tree_default(tree, 'dictionary_item_added')
         self._from_tree_default(tree, 'dictionary_item_removed')
@@ -321,6 +323,27 @@ class DeltaResult(TextResult):
         self._from_tree_set_item_added(tree)
         self._from_tree_repetition_change(tree)
 
+    @staticmethod
+    def _get_tree_without_changes_inside_moved_items(tree):
+        """
+        The changes inside the items that are moved are reported under their paths in t1.
+        The delta adds the moved items back with their values in t2 after removing them, so those changes are
+        already applied by the moves and are left out. The levels inside a moved item are the ones that have
+        a level above them, or are themselves the level, that pairs the same items in t1 and t2 as the move.
+        """
+        moved_items = {(level.path(), level.path(use_t2=True)) for level in tree['iterable_item_moved']}
+        result = TreeResult()
+        for report_type, levels in tree.items():
+            result[report_type] = PrettyOrderedSet()
+            for level in levels:
+                # A move is only left out when it is inside another moved item.
+                up = level.up if report_type == 'iterable_item_moved' else level
+                while up is not None and (up.path(), up.path(use_t2=True)) not in moved_items:
+                    up = up.up
+                if up is None:
+                    result[report_type].add(level)
+        return result
+
     def _from_tree_iterable_item_added_or_removed(self, tree, report_type, delta_report_key):
         if report_type in tree:
             for change in tree[report_type]:  # report each change
@@ -343,27 +366,7 @@ class DeltaResult(TextResult):
     def _from_tree_type_changes(self, tree):
         if 'type_changes' in tree:
             for change in tree['type_changes']:
-                include_values = None
-                if type(change.t1) is type:
-                    include_values = False
-                    old_type = change.t1
-                    new_type = change.t2
-                else:
-                    old_type = get_type(change.t1)
-                    new_type = get_type(change.t2)
-                    include_values = True
-                    try:
-                        if new_type in numpy_numbers:
-                            new_t1 = change.t1.astype(new_type)
-                            include_values = not np.array_equal(new_t1, change.t2)
-                        else:
-                            new_t1 = new_type(change.t1)
-                            # If simply applying the type from one value converts it to the other value,
-                            # there is no need to include the actual values in the delta.
-                            include_values = new_t1 != change.t2
-                    except Exception:
-                        pass
-
+                old_type, new_type, include_values = get_delta_type_change(change.t1, change.t2)
                 remap_dict = RemapDict({
                     'old_type': old_type,
                     'new_type': new_type
@@ -406,6 +409,30 @@ class DeltaResult(TextResult):
                     force=FORCE_DEFAULT)] = the_changed
 
 
+def get_delta_type_change(t1, t2):
+    """
+    Get the old type, the new type and whether the values need to be included in the delta
+    for the type change of t1 to t2.
+    """
+    if type(t1) is type:
+        return t1, t2, False
+    old_type = get_type(t1)
+    new_type = get_type(t2)
+    include_values = True
+    try:
+        if new_type in numpy_numbers:
+            new_t1 = t1.astype(new_type)
+            include_values = not np.array_equal(new_t1, t2)
+        else:
+            new_t1 = new_type(t1)
+            # If simply applying the type from one value converts it to the other value,
+            # there is no need to include the actual values in the delta.
+            include_values = new_t1 != t2
+    except Exception:
+        pass
+    return old_type, new_type, include_values
+
+
 class DiffLevel:
     """
     An object of this class represents a single object-tree-level in a reported change.
@@ -546,7 +573,12 @@ class DiffLevel:
         # Another ChildRelationship object describing the relationship between t2 and it's child object.
         self.t2_child_rel = child_rel2
 
-        # Will cache result of .path() per 'force' as key for performance
+        # The arguments to create the child relationships of up to this level: (klass, param, param2)
+        # This is set by branch_deeper since the levels above are shared with the other branches
+        # until materialize_chain is called.
+        self._up_child_rel = None
+
+        # Will cache result of .path() per 'force', 'use_t2' and 'output_format' as key for performance
         self._path = dict_()
 
         self.verbose_level = verbose_level
@@ -648,62 +680,111 @@ class DiffLevel:
                               string representation of the path or 'list' to produce a list of keys and attributes
                               that produce the path.
         """
-        # TODO: We could optimize this by building on top of self.up's path if it is cached there
-        cache_key = "{}{}{}{}".format(force, get_parent_too, use_t2, output_format)
-        if cache_key in self._path:
-            cached = self._path[cache_key]
-            if get_parent_too:
-                parent, param, result = cached
-                return (self._format_result(root, parent), param, self._format_result(root, result))
-            else:
-                return self._format_result(root, cached)
+        cache_key = (force, use_t2, output_format)
+        cached = self._path.get(cache_key)
+        if cached is None:
+            cached = self._get_path_cache(cache_key)
+        _, parent, param, result = cached
 
         if output_format == 'str':
-            result = parent = param = ""
-        else:
-            result = []
-
-        level = self.all_up  # start at the root
-
-        # traverse all levels of this relationship
-        while level and level is not self:
-            # get this level's relationship object
-            if(use_t2):
-                next_rel = level.t2_child_rel
+            if get_parent_too:
+                output = (self._format_result(root, parent), param, self._format_result(root, result))
             else:
-                next_rel = level.t1_child_rel or level.t2_child_rel  # next relationship object to get a formatted param from
+                output = self._format_result(root, result)
+        else:
+            output = list(result)
+        return output
 
-            # t1 and t2 both are empty
-            if next_rel is None:
+    def _get_path_cache(self, cache_key):
+        """
+        The path of each level is built on top of the cached path of the level above it.
+        So we go up until we find a level with its path cached and then we go down and cache
+        the path of every level on the way.
+        The cached values are tuples of (done, parent, param, result). Once done is True, the path does not
+        get extended for the levels below.
+        """
+        levels = []
+        level = self
+        while True:
+            cached = level._path.get(cache_key)
+            if cached is not None:
                 break
+            if level.up is None:
+                # The root level
+                cached = (False, '', '', '' if cache_key[2] == 'str' else ())
+                level._path[cache_key] = cached
+                break
+            levels.append(level)
+            level = level.up
 
-            # Build path for this level
-            if output_format == 'str':
-                item = next_rel.get_param_repr(force)
-                if item:
-                    parent = result
-                    param = next_rel.param
-                    result += item
-                else:
-                    # it seems this path is not representable as a string
-                    result = None
-                    break
-            elif output_format == 'list':
-                result.append(next_rel.param)
+        for level in reversed(levels):
+            cached = level._path[cache_key] = level._extend_path_of_up(cached, cache_key)
+        return cached
 
-            # Prepare processing next level
-            level = level.down
+    def _extend_path_of_up(self, up_cached, cache_key):
+        done, parent, param, result = up_cached
+        if done:
+            return up_cached
+        force, use_t2, output_format = cache_key
+        next_rel = self.get_up_child_rel(use_t2=use_t2)
+
+        # t1 and t2 both are empty
+        if next_rel is None:
+            return (True, parent, param, result)
 
         if output_format == 'str':
-            if get_parent_too:
-                self._path[cache_key] = (parent, param, result)
-                output = (self._format_result(root, parent), param, self._format_result(root, result))
-            else:
-                self._path[cache_key] = result
-                output = self._format_result(root, result)
-        else:
-            output = result
-        return output
+            item = next_rel.get_param_repr(force)
+            if item:
+                return (False, result, next_rel.param, result + item)
+            # it seems this path is not representable as a string
+            return (True, parent, param, None)
+        return (False, parent, param, result + (next_rel.param, ))
+
+    def get_path_filter_state(self, path_filter):
+        """
+        Get the state of the path filter for the path of this level.
+        Just like the path, the state is built on top of the cached state of the level above it.
+        """
+        levels = []
+        level = self
+        while True:
+            if path_filter in level._path:
+                state = level._path[path_filter]
+                break
+            if level.up is None:
+                state = level._path[path_filter] = path_filter.get_state('root')
+                break
+            levels.append(level)
+            level = level.up
+
+        for level in reversed(levels):
+            if state is not None:
+                next_rel = level.get_up_child_rel()
+                item = None if next_rel is None else next_rel.get_param_repr()
+                state = None if item is None else path_filter.advance(state, item)
+            level._path[path_filter] = state
+        return state
+
+    def get_up_child_rel(self, use_t2=False):
+        """
+        Get the relationship object from the level above to this level.
+        By default it is the t1 relationship unless t1 is not present.
+        """
+        up = self.up
+        if up.down is self:
+            if use_t2:
+                return up.t2_child_rel
+            return up.t1_child_rel or up.t2_child_rel
+        if self._up_child_rel is None:
+            return None
+        # The level above is shared with other branches so the relationship is created on the fly.
+        klass, param, param2 = self._up_child_rel
+        if not use_t2 and self.t1 is not notpresent:
+            return ChildRelationship.create(klass=klass, parent=up.t1, child=self.t1, param=param)
+        if self.t2 is not notpresent:
+            return ChildRelationship.create(
+                klass=klass, parent=up.t2, child=self.t2, param=param if param2 is None else param2)
+        return None
 
     def create_deeper(self,
                       new_t1,
@@ -733,48 +814,67 @@ class DiffLevel:
                       child_relationship_param2=None,
                       report_type=None):
         """
-        Branch this comparison: Do not touch this comparison line, but create a new one with exactly the same content,
-        just one level deeper.
+        Branch this comparison: Do not touch this comparison line, but create a new level one level deeper.
+        The new level shares the levels above it with the other branches instead of getting a copy of them.
+        Its up is set but the down of this level is not. The chain of the new level becomes its own
+        once materialize_chain is called which happens when it is reported.
         :rtype: DiffLevel
         :return: New level in new comparison line
         """
-        branch = self.copy()
-        return branch.create_deeper(new_t1, new_t2, child_relationship_class,
-                                    child_relationship_param, child_relationship_param2, report_type)
+        result = DiffLevel(
+            new_t1, new_t2, report_type=report_type, verbose_level=self.verbose_level)
+        # Not using the setattr so that the down of this level does not change.
+        result.__dict__['up'] = self
+        result._up_child_rel = (child_relationship_class, child_relationship_param, child_relationship_param2)
+        return result
+
+    def materialize_chain(self):
+        """
+        Give this level its own copy of the levels above it that are shared with other branches.
+        After that the up, down, all_up, all_down and child relationships of the chain point to this comparison line.
+        """
+        level = self
+        while level.up is not None and level.up.down is not level:
+            up = copy(level.up)
+            up.additional = copy(up.additional)
+            up.down = level
+            up.auto_generate_child_rel(*level._up_child_rel)
+            level = up
 
     def copy(self):
         """
         Get a deep copy of this comparision line.
         :return: The leaf ("downmost") object of the copy.
         """
-        orig = self.all_up
-        result = copy(orig)  # copy top level
-
-        while orig is not None:
-            result.additional = copy(orig.additional)
-
-            if orig.down is not None:  # copy and create references to the following level
-                # copy following level
-                result.down = copy(orig.down)
-
-                if orig.t1_child_rel is not None:
-                    result.t1_child_rel = ChildRelationship.create(
-                        klass=orig.t1_child_rel.__class__,
-                        parent=result.t1,
-                        child=result.down.t1,
-                        param=orig.t1_child_rel.param)
-                if orig.t2_child_rel is not None:
-                    result.t2_child_rel = ChildRelationship.create(
-                        klass=orig.t2_child_rel.__class__,
-                        parent=result.t2,
-                        child=result.down.t2,
-                        param=orig.t2_child_rel.param)
-
-            # descend to next level
-            orig = orig.down
-            if result.down is not None:
-                result = result.down
-        return result
+        orig = self.all_down
+        result = leaf = copy(orig)
+        result.additional = copy(orig.additional)
+
+        while orig.up is not None:
+            up = copy(orig.up)
+            up.additional = copy(up.additional)
+            up.down = result
+            if orig.up.down is orig:
+                # copy and create references to the following level
+                if orig.up.t1_child_rel is not None:
+                    up.t1_child_rel = ChildRelationship.create(
+                        klass=orig.up.t1_child_rel.__class__,
+                        parent=up.t1,
+                        child=result.t1,
+                        param=orig.up.t1_child_rel.param)
+                if orig.up.t2_child_rel is not None:
+                    up.t2_child_rel = ChildRelationship.create(
+                        klass=orig.up.t2_child_rel.__class__,
+                        parent=up.t2,
+                        child=result.t2,
+                        param=orig.up.t2_child_rel.param)
+            elif orig._up_child_rel is not None:
+                up.auto_generate_child_rel(*orig._up_child_rel)
+
+            # ascend to the next level
+            orig = orig.up
+            result = up
+        return leaf
 
 
 class ChildRelationship:
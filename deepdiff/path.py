@@ -1,3 +1,4 @@
+import re
 import logging
 from ast import literal_eval
 from functools import lru_cache
@@ -167,3 +168,151 @@ def extract(obj, path):
     """
     elements = _path_to_elements(path, root_element=None)
     return _get_nested_obj(obj, elements)
+
+
+PATH_WILDCARD = '[*]'
+
+# The pieces of a path: "root", "[...]" or ".attr". A quote inside the brackets is closed only by the quote
+# that is followed by the end of the brackets or the tuple item so that keys with quotes in them stay in one piece.
+_PATH_PIECE_RE = re.compile(r"""\[(?:'.*?'(?=[\]),])|".*?"(?=[\]),])|[^\]'"])*\]|\.[^.\[]+|[^.\[]+""")
+
+
+def _split_path(path):
+    """
+    Split a path into the pieces that are appended to it one level at a time.
+
+        >>> _split_path("root['a'][1.5].b")
+        ['root', "['a']", '[1.5]', '.b']
+    """
+    pieces = _PATH_PIECE_RE.findall(path)
+    if ''.join(pieces) != path:
+        return [path]
+    return pieces
+
+
+class _PathTrieNode:
+
+    __slots__ = ('pieces', 'wildcard', 'is_match')
+
+    def __init__(self):
+        self.pieces = {}
+        self.wildcard = None
+        self.is_match = False
+
+
+# The node of every path that is inside one of the paths of the filter.
+_INSIDE_MATCH = _PathTrieNode()
+_INSIDE_MATCH.is_match = True
+
+
+class PathFilter:
+    """
+    A set of paths compiled into a trie.
+    Instead of formatting the full path of every object and looking it up in the set,
+    a traversal keeps a state per path and advances it with the piece that is appended to the path
+    when it goes one level deeper. Once the state is None, the path is neither one of the paths in the filter,
+    nor on the way to one nor inside one and there is nothing left to check in that subtree.
+    A [*] in a path matches any dictionary key or list index.
+
+        >>> path_filter = PathFilter(["root['a'][*]['b']"])
+        >>> state = path_filter.get_state("root['a']")
+        >>> state = path_filter.advance(state, '[0]')
+        >>> path_filter.is_match(path_filter.advance(state, "['b']"))
+        True
+        >>> path_filter.advance(state, "['c']") is None
+        True
+    """
+
+    def __init__(self, paths):
+        self.paths = frozenset(paths)
+        self._root = _PathTrieNode()
+        for path in self.paths:
+            node = self._root
+            for piece in _split_path(path):
+                if piece == PATH_WILDCARD:
+                    if node.wildcard is None:
+                        node.wildcard = _PathTrieNode()
+                    node = node.wildcard
+                else:
+                    child = node.pieces.get(piece)
+                    if child is None:
+                        child = node.pieces[piece] = _PathTrieNode()
+                    node = child
+            node.is_match = True
+
+    def get_state(self, path):
+        """
+        Get the state of a full path. For example the path the traversal starts from.
+        """
+        if not isinstance(path, str):
+            return None
+        state = (self._root, )
+        for piece in _split_path(path):
+            state = self.advance(state, piece)
+            if state is None:
+                break
+        return state
+
+    def advance(self, state, piece):
+        """
+        Get the state of the path of the given state followed by the piece. For example "['key']", "[0]" or ".attr".
+        Returns None if no path in the filter starts with that path and the path is not inside one of the paths.
+        """
+        if state is None:
+            return None
+        nodes = self._advance_nodes(state, piece)
+        # The repr of some keys, such as tuples or strings like "['x']", has brackets in it.
+        # Such a key is one piece when the traversal goes one level deeper but several pieces when a path is split.
+        if piece.find('[', 1) != -1:
+            sub_pieces = _split_path(piece)
+            if len(sub_pieces) > 1:
+                # The path is not inside a path that only matches some of the pieces of the key.
+                sub_nodes = state
+                for sub_piece in sub_pieces:
+                    sub_nodes = self._advance_nodes(sub_nodes, sub_piece, match_inside=False)
+                    if not sub_nodes:
+                        break
+                nodes.extend(node for node in sub_nodes if node not in nodes)
+        return tuple(nodes) or None
+
+    @staticmethod
+    def _advance_nodes(state, piece, match_inside=True):
+        nodes = []
+        is_item = piece[:1] == '['
+        for node in state:
+            if node.is_match:
+                if match_inside and (not nodes or nodes[0] is not _INSIDE_MATCH):
+                    nodes.insert(0, _INSIDE_MATCH)
+                if node is _INSIDE_MATCH:
+                    continue
+            if is_item and node.wildcard is not None:
+                nodes.append(node.wildcard)
+            node = node.pieces.get(piece)
+            if node is not None:
+                nodes.append(node)
+        return nodes
+
+    @staticmethod
+    def is_match(state):
+        """
+        Whether the path of the state is one of the paths in the filter or is inside one of them.
+        """
+        if state is not None:
+            for node in state:
+                if node.is_match:
+                    return True
+        return False
+
+
+@lru_cache(maxsize=256)
+def _compile_path_filter(paths):
+    return PathFilter(paths)
+
+
+def get_path_filter(paths):
+    """
+    Get the compiled PathFilter of the paths or None if there are no paths.
+    """
+    if not paths:
+        return None
+    return _compile_path_filter(frozenset(path for path in paths if isinstance(path, str)))
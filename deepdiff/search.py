@@ -7,6 +7,7 @@ import logging
 from deepdiff.helper import (
     strings, numbers, add_to_frozen_set, get_doc, dict_, RE_COMPILED_TYPE
 )
+from deepdiff.path import get_path_filter
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +32,7 @@ class DeepSearch(dict):
         Verbose level 2 shows the path and value of the found items.
 
     exclude_paths: list, default = None.
-        List of paths to exclude from the report.
+        List of paths to exclude from the report. Use [*] to match any dictionary key or list index.
 
     exclude_types: list, default = None.
         List of object types to exclude from the report.
@@ -106,6 +107,13 @@ class DeepSearch(dict):
         item = item if self.case_sensitive else item.lower()
         self.exclude_paths = OrderedSetPlus(exclude_paths)
         self.exclude_regex_paths = [re.compile(exclude_regex_path) for exclude_regex_path in exclude_regex_paths]
+        self.__exclude_paths_filter = get_path_filter(self.exclude_paths)
+        # The states of the exclude_paths filter for the paths that can still lead to an excluded path.
+        self.__exclude_path_states = {}
+        if self.__exclude_paths_filter is not None:
+            state = self.__exclude_paths_filter.get_state('root')
+            if state is not None:
+                self.__exclude_path_states['root'] = state
         self.exclude_types = OrderedSetPlus(exclude_types)
         self.exclude_types_tuple = tuple(
             exclude_types)  # we need tuple for checking isinstance
@@ -177,9 +185,17 @@ class DeepSearch(dict):
         self.__search_dict(
             obj, item, parent, parents_ids, print_as_attribute=True)
 
+    def __extend_exclude_path_state(self, parent, path):
+        """Advance the exclude_paths filter state of the parent to the path that is one level deeper."""
+        state = self.__exclude_path_states.get(parent)
+        if state is not None:
+            state = self.__exclude_paths_filter.advance(state, path[len(parent):])
+            if state is not None:
+                self.__exclude_path_states[path] = state
+
     def __skip_this(self, item, parent):
         skip = False
-        if parent in self.exclude_paths:
+        if self.__exclude_path_states and self.__exclude_paths_filter.is_match(self.__exclude_path_states.get(parent)):
             skip = True
         elif self.exclude_regex_paths and any(
                 [exclude_regex_path.search(parent) for exclude_regex_path in self.exclude_regex_paths]):
@@ -220,6 +236,8 @@ class DeepSearch(dict):
             parents_ids_added = add_to_frozen_set(parents_ids, item_id)
 
             new_parent = parent_text % (parent, item_key_str)
+            if self.__exclude_path_states:
+                self.__extend_exclude_path_state(parent, new_parent)
             new_parent_cased = new_parent if self.case_sensitive else new_parent.lower()
 
             str_item = str(item)
@@ -245,6 +263,8 @@ class DeepSearch(dict):
         """Search iterables except dictionaries, sets and strings."""
         for i, thing in enumerate(obj):
             new_parent = "{}[{}]".format(parent, i)
+            if self.__exclude_path_states:
+                self.__extend_exclude_path_state(parent, new_parent)
             if self.__skip_this(thing, parent=new_parent):
                 continue
 
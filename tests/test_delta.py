@@ -5,6 +5,7 @@ import json
 from decimal import Decimal
 from unittest import mock
 from deepdiff import Delta, DeepDiff
+from deepdiff.diff import ITERABLE_KEY_AND_COMPARE_FUNC_MSG
 from deepdiff.helper import np, number_to_string, TEXT_VIEW, DELTA_VIEW, CannotCompare
 from deepdiff.path import GETATTR, GET
 from deepdiff.delta import (
@@ -1059,6 +1060,26 @@ DELTA_NUMPY_TEST_CASES = {
         },
         'expected_result': 't2'
     },
+    'delta_numpy8_multi_dimensional_arrays_of_different_sizes': {
+        't1': np.array([[1, 2], [3, 4]]),
+        't2': np.array([[1, 2], [3, 5], [6, 7]]),
+        'deepdiff_kwargs': {},
+        'to_delta_kwargs': {},
+        'expected_delta_dict': {
+            'values_changed': {
+                'root[1][1]': {
+                    'new_value': 5
+                }
+            },
+            'iterable_item_added': {
+                'root[2]': [6, 7]
+            },
+            '_numpy_paths': {
+                'root': 'int64'
+            }
+        },
+        'expected_result': 't2'
+    },
 }
 
 
@@ -1145,6 +1166,7 @@ class TestDeltaOther:
             'report_repetition': True,
             'exclude_paths': None,
             'exclude_regex_paths': None,
+            'include_paths': None,
             'exclude_types': None,
             'exclude_types_tuple': None,
             'ignore_type_subclasses': False,
@@ -1168,6 +1190,15 @@ class TestDeltaOther:
             'custom_operators': [],
             'encodings': None,
             'ignore_encoding_errors': False,
+            'prune_equal_subtrees': False,
+            'iterable_key_func': None,
+            'iterable_alignment': None,
+            'lsh_bands_for_pairs': 0,
+            'max_candidates_for_pairs': None,
+            'memory_budget_for_pairs': 2 ** 27,
+            'optimal_pairs': False,
+            'partition_key_func': None,
+            'numpy_chunk_size': 2 ** 22,
         }
 
         expected = {'iterable_items_added_at_indexes': {'root': {1: 1, 2: 1, 3: 1}}, 'iterable_items_removed_at_indexes': {'root': {1: 2, 2: 2}}}
@@ -1525,3 +1556,60 @@ class TestDeltaCompareFunc:
         delta = Delta(ddiff)
         recreated_t2 = t1 + delta
         assert t2 == recreated_t2
+
+    @staticmethod
+    def key_func(item, level):
+        if not isinstance(item, dict):
+            raise CannotCompare
+        if level.path() == "root['path2']":
+            return item["ID"]
+        if "id" in item:
+            return item["id"]
+        raise CannotCompare
+
+    def test_key_func1(self, compare_func_t1, compare_func_t2, compare_func_result1):
+        ddiff = DeepDiff(
+            compare_func_t1, compare_func_t2,
+            iterable_key_func=self.key_func, verbose_level=1)
+        assert compare_func_result1 == ddiff
+        delta = Delta(ddiff)
+        recreated_t2 = compare_func_t1 + delta
+        assert compare_func_t2 == recreated_t2
+
+    @pytest.mark.parametrize('t1, t2', [
+        ([{'id': 1, 'val': 1}, {'id': 2, 'val': 2}, {'id': 1, 'val': 3}, {'id': 3, 'val': 3}],
+         [{'id': 3, 'val': 3}, {'id': 2, 'val': 2}, {'id': 1, 'val': 3}]),
+        ([{'id': 3, 'val': 3}, {'id': 2, 'val': 2}, {'id': 1, 'val': 3}],
+         [{'id': 1, 'val': 1}, {'id': 2, 'val': 2}, {'id': 1, 'val': 3}, {'id': 3, 'val': 3}]),
+        ([{'id': 1, 'val': 1}, {'id': 1, 'val': 3}], [{'id': 1, 'val': 3}, {'id': 1, 'val': 1}]),
+        ([{'id': 0, 'val': 2}, {'id': 2, 'val': 2}], [{'id': 2, 'val': 2, 'dealers': []}, {'id': 0, 'val': 2}]),
+        ({"path1": [{'id': 1, 'val': 1}, {'id': 2, 'val': 3}], "path2": [{'ID': 4, 'val': 3}, {'ID': 3, 'val': 1}],
+          "path3": [{'no_id': 5, 'val': 1}, {'no_id': 6, 'val': 3}]},
+         {"path1": [{'id': 2, 'val': 3}, {'id': 5, 'val': 1}], "path2": [{'ID': 3, 'val': 1}, {'ID': 4, 'val': 3}],
+          "path3": [{'no_id': 6, 'val': 1}, {'no_id': 5, 'val': 3}]}),
+    ])
+    def test_key_func_pairs_like_compare_func(self, t1, t2):
+        ddiff = DeepDiff(t1, t2, iterable_key_func=self.key_func, verbose_level=2)
+        assert DeepDiff(t1, t2, iterable_compare_func=self.compare_func, verbose_level=2) == ddiff
+        delta = Delta(ddiff)
+        recreated_t2 = t1 + delta
+        assert t2 == recreated_t2
+
+    def test_key_func_and_compare_func_can_not_be_used_together(self):
+        with pytest.raises(ValueError) as excinfo:
+            DeepDiff([1], [2], iterable_key_func=self.key_func, iterable_compare_func=self.compare_func)
+        assert ITERABLE_KEY_AND_COMPARE_FUNC_MSG == str(excinfo.value)
+
+    @pytest.mark.parametrize('t1, t2', [
+        ([1, 2, 3], [3, 2, 1]),
+        (['p', {'a': [1, 2]}, 'b'], ['q', 'r', 'p', {'a': [1, 3, 4]}, 'b']),
+        ([{'k': [1, 2]}, [1, [3]], 'a', 5], ['b', {'k': [1, 2]}, [1, [2]], 'b', 5.0, {'k': [1, 3]}]),
+        ([1, []], [2, 1, ['b']]),
+        ([[], [0]], [0, [], ['b', 0]]),
+        (['c', [1.5, 2]], [2, None, 'c', [0, 1.5, 1.5]]),
+        ([1.5, 1, None], [1, {}]),
+    ])
+    def test_iterable_alignment_lcs(self, t1, t2):
+        ddiff = DeepDiff(t1, t2, iterable_alignment='lcs')
+        delta = Delta(ddiff)
+        assert t2 == t1 + delta
@@ -1,5 +1,6 @@
 import pytest
 from deepdiff import DeepDiff
+from deepdiff.diff import NUMPY_CHUNK_SIZE_MSG
 from deepdiff.helper import np
 from tests import parameterize_cases
 
@@ -111,6 +112,40 @@ NUMPY_CASES = {
         'deepdiff_kwargs': {'significant_digits': 3},
         'expected_result': {},
     },
+    'numpy_multi_dimensional_significant_digits': {
+        't1': np.array([[0.125, 1.005, 0.5], [2.675, -0.001, 0.0]]),
+        't2': np.array([[0.12, 1.0, 0.5], [2.67, 0.0, 1.0]]),
+        'deepdiff_kwargs': {'significant_digits': 2},
+        'expected_result': {'values_changed': {'root[1][2]': {'new_value': 1.0, 'old_value': 0.0}}},
+    },
+    'numpy_multi_dimensional_math_epsilon': {
+        't1': np.array([[1.0, 2.0], [3.0, 4.0]]),
+        't2': np.array([[1.0005, 2.0], [3.0, 4.5]]),
+        'deepdiff_kwargs': {'math_epsilon': 0.001},
+        'expected_result': {'values_changed': {'root[1][1]': {'new_value': 4.5, 'old_value': 4.0}}},
+    },
+    'numpy_multi_dimensional_ignore_nan_inequality': {
+        't1': np.array([[1.0, np.nan], [3.0, np.nan]]),
+        't2': np.array([[1.0, np.nan], [3.5, np.nan]]),
+        'deepdiff_kwargs': {'ignore_nan_inequality': True},
+        'expected_result': {'values_changed': {'root[1][0]': {'new_value': 3.5, 'old_value': 3.0}}},
+    },
+    'numpy_multi_dimensional_different_shape': {
+        't1': np.array([[1, 2, 3], [4, 5, 6]]),
+        't2': np.array([[1, 2], [4, 7], [8, 9]]),
+        'deepdiff_kwargs': {},
+        'expected_result': {
+            'values_changed': {'root[1][1]': {'new_value': 7, 'old_value': 5}},
+            'iterable_item_added': {'root[2]': [8, 9]},
+            'iterable_item_removed': {'root[0][2]': 3, 'root[1][2]': 6},
+        },
+    },
+    'numpy_ignore_order_rows_with_repetitions': {
+        't1': np.array([[1, 1, 2], [4, 5, 6]]),
+        't2': np.array([[1, 2, 2], [6, 5, 4]]),
+        'deepdiff_kwargs': {'ignore_order': True},
+        'expected_result': {},
+    },
     'numpy_different_shape': {
         't1': np.array([[1, 1], [2, 3]]),
         't2': np.array([1]),
@@ -141,3 +176,55 @@ class TestNumpy:
     def test_numpy(self, t1, t2, deepdiff_kwargs, expected_result):
         diff = DeepDiff(t1, t2, **deepdiff_kwargs)
         assert expected_result == diff
+
+    @pytest.mark.parametrize('t1, t2, deepdiff_kwargs', [
+        (np.arange(12.).reshape(4, 3), np.arange(12.).reshape(4, 3) + [0, 0, 1], {}),
+        (np.arange(12).reshape(4, 3), np.arange(15).reshape(5, 3), {}),
+        (np.arange(12.).reshape(2, 3, 2), np.arange(12.).reshape(2, 3, 2) + 0.004, {'significant_digits': 2}),
+        (np.array([1.0, 2.0, 3.0, 4.0]), np.array([1.0, 2.5, 3.0, 4.5]), {'math_epsilon': 0.1}),
+    ])
+    def test_numpy_chunks(self, t1, t2, deepdiff_kwargs):
+        diff = DeepDiff(t1, t2, **deepdiff_kwargs)
+        assert diff == DeepDiff(t1, t2, numpy_chunk_size=1, **deepdiff_kwargs)
+        assert diff == DeepDiff(t1, t2, numpy_chunk_size=20, **deepdiff_kwargs)
+
+    @pytest.mark.filterwarnings('error')
+    @pytest.mark.parametrize('deepdiff_kwargs', [{'significant_digits': 2}, {'math_epsilon': 0.001}])
+    def test_numpy_chunks_that_overflow(self, deepdiff_kwargs):
+        diff = DeepDiff(np.array([1e308, 1.0]), np.array([-1e308, 1.0]), **deepdiff_kwargs)
+        expected = {'values_changed': {'root[0]': {'new_value': -1e308, 'old_value': 1e308}}}
+        assert expected == diff
+
+    def test_numpy_memmap(self, tmp_path):
+        t1 = np.arange(1000.).reshape(100, 10)
+        t2 = t1.copy()
+        t2[3, 4] = 0.5
+        t2[99, 9] = 1.5
+        np.save(tmp_path / 't1.npy', t1)
+        np.save(tmp_path / 't2.npy', t2)
+        t1 = np.load(tmp_path / 't1.npy', mmap_mode='r')
+        t2 = np.load(tmp_path / 't2.npy', mmap_mode='r')
+        diff = DeepDiff(t1, t2, numpy_chunk_size=160)
+        expected = {'values_changed': {'root[3][4]': {'new_value': 0.5, 'old_value': 34.0},
+                                       'root[99][9]': {'new_value': 1.5, 'old_value': 999.0}}}
+        assert expected == diff
+        assert not DeepDiff(t1, t1.copy(), numpy_chunk_size=160)
+
+    @pytest.mark.parametrize('t1, t2, deepdiff_kwargs', [
+        (np.array([[1, 2, 3], [4, 5, 6], [7, 8, 9]]), np.array([[9, 8, 7], [3, 2, 1], [4, 5, 7]]), {}),
+        (np.array([[1, 1, 2], [4, 5, 6]]), np.array([[1, 2, 2], [6, 5, 4]]), {'report_repetition': True}),
+        (np.array([[np.nan, 0.0], [1.5, 2.5]]), np.array([[-0.0, np.nan], [2.5, 1.5], [3.0, 4.0]]), {}),
+        (np.array([[0.123, 1.0], [2.0, 3.0]]), np.array([[1.0, 0.121], [5.0, 6.0]]), {'significant_digits': 2}),
+        (np.array([1.0, 2.0, np.nan, 2.0]), np.array([np.nan, 2.0, 3.0]), {'cutoff_intersection_for_pairs': 1}),
+        (np.array([True, False]), np.array([False]), {}),
+    ])
+    def test_numpy_rows_hashed_with_numpy(self, t1, t2, deepdiff_kwargs):
+        diff = DeepDiff(t1, t2, ignore_order=True, **deepdiff_kwargs)
+        # exclude_types makes DeepHash hash every row.
+        assert diff == DeepDiff(t1, t2, ignore_order=True, exclude_types=[set], **deepdiff_kwargs)
+
+    @pytest.mark.parametrize('numpy_chunk_size', [0, None, 1.5])
+    def test_numpy_chunk_size_is_validated(self, numpy_chunk_size):
+        with pytest.raises(ValueError) as excinfo:
+            DeepDiff(np.array([1]), np.array([2]), numpy_chunk_size=numpy_chunk_size)
+        assert NUMPY_CHUNK_SIZE_MSG == str(excinfo.value)
@@ -1,11 +1,14 @@
 import pytest
 import datetime
+from collections.abc import Mapping
 from time import sleep
 from unittest import mock
 from deepdiff.model import DiffLevel
+from deepdiff.helper import notpresent
 from deepdiff.diff import (
-    DeepDiff, PROGRESS_MSG, INVALID_VIEW_MSG, VERBOSE_LEVEL_RANGE_MSG,
-    PURGE_LEVEL_RANGE_MSG)
+    DeepDiff, iter_diff, deep_equal, PROGRESS_MSG, INVALID_VIEW_MSG, VERBOSE_LEVEL_RANGE_MSG,
+    PURGE_LEVEL_RANGE_MSG, DIFF_COUNT, INVALID_ITERABLE_ALIGNMENT_MSG, ITERABLE_ALIGNMENT_WITH_FUNC_MSG,
+    ITER_DIFF_VIEW_MSG, _is_natively_equal)
 
 
 class SlowDiffLevel(DiffLevel):
@@ -120,3 +123,247 @@ class TestDiffOther:
     def test_get_distance_cache_key(self):
         result = DeepDiff._get_distance_cache_key(added_hash=5, removed_hash=20)
         assert b'0x14--0x5dc' == result
+
+    @pytest.mark.parametrize('t1, t2, kwargs', [
+        ({'a': [1, 2, {'b': 3}], 'c': {'d': [1, 2]}}, {'a': [1, 2, {'b': 3}], 'c': {'d': [2, 1]}}, {}),
+        ({'a': [1, 2, {'b': 3}], 'c': {'d': [1, 2]}}, {'a': [1, 2, {'b': 3}], 'c': {'d': [2, 1, 1]}},
+         {'ignore_order': True}),
+        ({'a': [1, 2], 'e': (1, ), 'f': [1]}, {'a': [1, 2], 'e': (1.0, ), 'f': [1.0]}, {}),
+        ([[1, 2], [3, [4]]], [[1, 2], [3, [5]]], {'verbose_level': 2}),
+        ([{'a': 1}, {1, 2}], [{'a': 1}, {1, 3}], {}),
+        ([[float('nan')]], [[float('nan')]], {}),
+        ({'a': [float('nan'), 1]}, {'a': [float('nan'), 1]}, {'ignore_nan_inequality': True}),
+        ({'a': [1], 'b': 1.0}, {'a': [1], 'b': 1}, {'ignore_order': True}),
+        ([[1]], [[1]], {'iterable_key_func': lambda x, level: id(x)}),
+    ])
+    def test_prune_equal_subtrees(self, t1, t2, kwargs):
+        diff = DeepDiff(t1, t2, **kwargs)
+        pruned_diff = DeepDiff(t1, t2, prune_equal_subtrees=True, **kwargs)
+        assert diff == pruned_diff
+
+    def test_prune_equal_subtrees_skips_equal_items(self):
+        # Sets are not checked with the native == so pruning is what skips them.
+        t1 = {'a': [{1, 2, 3}] * 10, 'b': 1}
+        t2 = {'a': [{1, 2, 3}] * 10, 'b': 2}
+        diff = DeepDiff(t1, t2, prune_equal_subtrees=True)
+        assert {'values_changed': {"root['b']": {'new_value': 2, 'old_value': 1}}} == diff
+        assert DeepDiff(t1, t2).get_stats()[DIFF_COUNT] > diff.get_stats()[DIFF_COUNT]
+
+    def test_prune_equal_subtrees_with_exclude_paths(self):
+        t1 = {'a': [1, 2], 'b': [3, 4]}
+        t2 = {'a': [1, 5], 'b': [3, 4]}
+        diff = DeepDiff(t1, t2, prune_equal_subtrees=True, exclude_paths=["root['a'][1]"])
+        assert {} == diff
+
+    @pytest.mark.parametrize('ignore_order', [False, True])
+    def test_prune_equal_subtrees_with_exclude_paths_of_shared_objects(self, ignore_order):
+        x = [1, 2]
+        z = [1, 3]
+        diff = DeepDiff({'a': x, 'b': x}, {'a': z, 'b': z}, exclude_paths=["root['a'][1]"],
+                        prune_equal_subtrees=True, ignore_order=ignore_order)
+        assert {'values_changed': {"root['b'][1]": {'new_value': 3, 'old_value': 2}}} == diff
+
+    @pytest.mark.parametrize('t1, t2, expected', [
+        ([1, {'a': (2, 3)}], [1, {'a': (2, 3)}], True),
+        ([1, {'a': (2, 3)}], [1, {'a': (2, 3.0)}], False),
+        ({'a': [True]}, {'a': [1]}, False),
+        ({'a': 1, 'b': None}, {'b': None, 'a': 1}, True),
+        ([{1, 2}], [{1, 2}], False),
+        ([float('nan')], [float('nan')], False),
+        (1, 1.0, False),
+    ])
+    def test_is_natively_equal(self, t1, t2, expected):
+        assert expected is _is_natively_equal(t1, t2)
+
+    def test_native_equality_skips_equal_items(self):
+        t1 = {'a': [[1, 2, 3]] * 10, 'b': 1}
+        t2 = {'a': [[1, 2, 3]] * 10, 'b': 2}
+        diff = DeepDiff(t1, t2)
+        assert {'values_changed': {"root['b']": {'new_value': 2, 'old_value': 1}}} == diff
+        assert 5 == diff.get_stats()[DIFF_COUNT]
+        t2['a'] = [[1, 2, 3.0]] * 10
+        diff = DeepDiff(t1, t2)
+        assert "root['a'][9][2]" in diff['type_changes']
+        diff = DeepDiff(t1, t2, ignore_numeric_type_changes=True)
+        assert {'values_changed': {"root['b']": {'new_value': 2, 'old_value': 1}}} == diff
+
+    def test_native_equality_is_not_used_with_iterable_key_func(self):
+        item = [1]
+        t1 = {'a': [item, [2]]}
+        t2 = {'a': [item, [2]]}
+        # t1 == t2 but only the items that are the same object have the same key.
+        diff = DeepDiff(t1, t2, iterable_key_func=lambda x, level: id(x))
+        assert {'values_changed': {"root['a'][1]": {'new_value': [2], 'old_value': [2]}}} == diff
+        assert diff == DeepDiff(t1, t2, iterable_compare_func=lambda x, y, level: x is y)
+
+    @pytest.mark.parametrize('t1, t2, expected', [
+        ([1, 2, 3], [0, 1, 2, 3], {'iterable_item_added': {'root[0]': 0}}),
+        ([1, 2, 3, 4], [1, 3, 4], {'iterable_item_removed': {'root[1]': 2}}),
+        ([{'a': 1}, {'a': 2}, {'a': 3}], [{'b': 0}, {'a': 1}, {'a': 20}, {'a': 3}],
+         {'iterable_item_added': {'root[0]': {'b': 0}},
+          'values_changed': {"root[1]['a']": {'new_value': 20, 'old_value': 2}}}),
+        ((1, [2, 3]), (1, [0, 2, 3]), {'iterable_item_added': {'root[1][0]': 0}}),
+        ([1, 2, 3], [1, 2.0, 3], {'type_changes': {'root[1]': {
+            'old_type': int, 'new_type': float, 'old_value': 2, 'new_value': 2.0}}}),
+        ([1, 2, 3], [3, 2, 1], {'iterable_item_added': {'root[0]': 3, 'root[1]': 2},
+                                'iterable_item_removed': {'root[1]': 2, 'root[2]': 3}}),
+    ])
+    def test_iterable_alignment_lcs(self, t1, t2, expected):
+        diff = DeepDiff(t1, t2, iterable_alignment='lcs')
+        assert expected == diff
+
+    def test_iterable_alignment_lcs_reports_changes_of_moved_items_under_their_index_in_t1(self):
+        diff = DeepDiff([1, []], [2, 1, ['b']], iterable_alignment='lcs')
+        assert {'iterable_item_added': {'root[0]': 2, 'root[1][0]': 'b'}} == diff
+        diff = DeepDiff([1, []], [2, 1, ['b']], iterable_alignment='lcs', verbose_level=2)
+        expected = {
+            'iterable_item_added': {'root[0]': 2, 'root[1][0]': 'b'},
+            'iterable_item_moved': {'root[1]': {'new_path': 'root[2]', 'value': ['b']}}}
+        assert expected == diff
+        t1 = [{'id': 0, 'v': 0}, {'id': 1, 'v': 1}]
+        t2 = [{'id': 9, 'v': 9}, {'id': 0, 'v': 0}, {'id': 1, 'v': 5}]
+        diff = DeepDiff(t1, t2, iterable_alignment='lcs')
+        assert {"root[1]['v']"} == set(diff['values_changed'])
+        assert diff['values_changed'] == DeepDiff(
+            t1, t2, iterable_key_func=lambda item, level: item['id'])['values_changed']
+
+    def test_iterable_alignment_lcs_reports_in_proportion_to_the_changes(self):
+        t1 = [{'id': i, 'value': [i]} for i in range(1000)]
+        t2 = [{'id': -1, 'value': []}] + t1[:500] + t1[501:]
+        assert 500 < len(DeepDiff(t1, t2)['values_changed'])
+        diff = DeepDiff(t1, t2, iterable_alignment='lcs', verbose_level=2)
+        expected = {
+            'iterable_item_added': {'root[0]': {'id': -1, 'value': []}},
+            'iterable_item_removed': {'root[500]': {'id': 500, 'value': [500]}}}
+        assert expected == diff
+        assert diff.get_stats()[DIFF_COUNT] < 10
+
+    def test_iterable_alignment_invalid(self):
+        with pytest.raises(ValueError) as excinfo:
+            DeepDiff([1], [2], iterable_alignment='myers')
+        assert INVALID_ITERABLE_ALIGNMENT_MSG.format('myers') == str(excinfo.value)
+        with pytest.raises(ValueError) as excinfo:
+            DeepDiff([1], [2], iterable_alignment='lcs', iterable_key_func=lambda item, level: item)
+        assert ITERABLE_ALIGNMENT_WITH_FUNC_MSG == str(excinfo.value)
+
+    def test_deeply_nested_objects_do_not_hit_the_recursion_limit(self):
+        t1, t2 = 1, 2
+        for i in range(600):
+            t1 = {'a': t1} if i % 2 else [t1]
+            t2 = {'a': t2} if i % 2 else [t2]
+        diff = DeepDiff(t1, t2)
+        expected_path = "root" + "['a'][0]" * 300
+        assert {'values_changed': {expected_path: {'new_value': 2, 'old_value': 1}}} == diff
+
+    def test_loop_in_nested_objects(self):
+        t1 = [1, {'a': [2]}]
+        t1[1]['a'].append(t1)
+        t2 = [1, {'a': [3]}]
+        t2[1]['a'].append(t2)
+        diff = DeepDiff(t1, t2)
+        assert {'values_changed': {"root[1]['a'][0]": {'new_value': 3, 'old_value': 2}}} == diff
+
+    def test_diff_methods_are_refreshed_when_abc_registrations_change(self):
+
+        class Bag:
+            def __init__(self, **items):
+                self.items = items
+
+            def __getitem__(self, key):
+                return self.items[key]
+
+            def __iter__(self):
+                return iter(self.items)
+
+            def __len__(self):
+                return len(self.items)
+
+            def keys(self):
+                return self.items.keys()
+
+        t1 = Bag(a=1)
+        t2 = Bag(a=2)
+        # It is iterated as an iterable of keys.
+        assert {} == DeepDiff(t1, t2)
+        Mapping.register(Bag)
+        diff = DeepDiff(t1, t2)
+        assert {"root['a']"} == set(diff['values_changed'])
+
+    def test_iter_diff(self):
+        t1 = {'a': 1, 'b': [1, 2, 3], 'c': {'d': 'x'}}
+        t2 = {'a': 2, 'b': [1, 5], 'e': None}
+        changes = list(iter_diff(t1, t2))
+        expected = [
+            ('values_changed', "root['a']", 1, 2),
+            ('values_changed', "root['b'][1]", 2, 5),
+            ('iterable_item_removed', "root['b'][2]", 3, notpresent),
+        ]
+        for change in expected:
+            assert change in changes
+        assert ('dictionary_item_added', "root['e']", notpresent, None) in changes
+        assert ('dictionary_item_removed', "root['c']", {'d': 'x'}, notpresent) in changes
+        assert 5 == len(changes)
+        assert set(DeepDiff(t1, t2, view='tree')) == {change[0] for change in changes}
+
+    def test_iter_diff_with_ignore_order(self):
+        t1 = [{'a': 1}, {'b': 2}, 3]
+        t2 = [{'b': 2}, 4, {'a': 1}]
+        changes = list(iter_diff(t1, t2, ignore_order=True))
+        assert [('values_changed', 'root[2]', 3, 4)] == changes
+
+    def test_iter_diff_with_ignore_order_merges_nested_add_removes(self):
+        t1 = [[[None], 1.5, 2], [([1.5, 'c', 'b', False],), 3], 4]
+        t2 = [False, (None, [], 1), 4]
+        changes = list(iter_diff(t1, t2, ignore_order=True))
+        diff = DeepDiff(t1, t2, ignore_order=True, view='tree')
+        expected = {(report_type, level.path()) for report_type, levels in diff.items() for level in levels}
+        assert ('values_changed', 'root[0]', [[None], 1.5, 2], False) in changes
+        assert expected == {(report_type, path) for report_type, path, _, _ in changes}
+
+    def test_iter_diff_can_be_closed_early(self):
+        t1 = [[i] for i in range(1000)]
+        t2 = [[i + 1] for i in range(1000)]
+        visited = []
+
+        def exclude_obj_callback(obj, path):
+            visited.append(path)
+            return False
+
+        changes = iter_diff(t1, t2, exclude_obj_callback=exclude_obj_callback)
+        assert not visited
+        assert ('values_changed', 'root[0][0]', 0, 1) == next(changes)
+        changes.close()
+        assert len(visited) < 20
+        assert [] == list(changes)
+
+    @pytest.mark.parametrize('view', ['tree', 'text'])
+    def test_iter_diff_does_not_take_view(self, view):
+        with pytest.raises(ValueError) as excinfo:
+            iter_diff([1], [2], view=view)
+        assert ITER_DIFF_VIEW_MSG == str(excinfo.value)
+
+    @pytest.mark.parametrize('t1, t2, params, expected', [
+        ({'a': [1, 2]}, {'a': [1, 2]}, {}, True),
+        ({'a': [1, 2]}, {'a': [1, 3]}, {}, False),
+        ([1, 2, 3], [3, 2, 1], {}, False),
+        ([1, 2, 3], [3, 2, 1], {'ignore_order': True}, True),
+        ([1.0001], [1.0002], {'significant_digits': 2}, True),
+        ({'a': 1, 'b': 2}, {'a': 1, 'b': 3}, {'exclude_paths': ["root['b']"]}, True),
+        ({'a': 1, 'b': 2}, {'a': 1, 'b': 3}, {'include_paths': ["root['a']"]}, True),
+        ({'a': 1}, {'a': 1, 'b': 3}, {}, False),
+    ])
+    def test_deep_equal(self, t1, t2, params, expected):
+        assert expected is deep_equal(t1, t2, **params)
+        assert expected is not bool(DeepDiff(t1, t2, **params))
+
+    def test_deep_equal_stops_at_the_first_difference(self):
+        t1 = [[i] for i in range(1000)]
+        t2 = [[i + 1] for i in range(1000)]
+        visited = []
+
+        def exclude_obj_callback(obj, path):
+            visited.append(path)
+            return False
+
+        assert deep_equal(t1, t2, exclude_obj_callback=exclude_obj_callback) is False
+        assert len(visited) < 20
@@ -1367,6 +1367,43 @@ class TestDeepDiffText:
         result = {}
         assert result == ddiff
 
+    def test_include_paths(self):
+        t1 = {'spec': {'containers': [{'image': 'a:1', 'ts': 1}], 'replicas': 1}, 'status': {'ts': 1}}
+        t2 = {'spec': {'containers': [{'image': 'a:2', 'ts': 2}], 'replicas': 2}, 'status': {'ts': 2}, 'new': 1}
+        ddiff = DeepDiff(t1, t2, include_paths="root['spec']['containers']")
+        result = {'values_changed': {"root['spec']['containers'][0]['image']": {'new_value': 'a:2', 'old_value': 'a:1'},
+                                     "root['spec']['containers'][0]['ts']": {'new_value': 2, 'old_value': 1}}}
+        assert result == ddiff
+        ddiff = DeepDiff(t1, t2, include_paths=["root['spec']['containers'][*]['image']", "root['new']"])
+        result = {
+            'values_changed': {"root['spec']['containers'][0]['image']": {'new_value': 'a:2', 'old_value': 'a:1'}},
+            'dictionary_item_added': ["root['new']"]}
+        assert result == ddiff
+
+    def test_include_and_exclude_paths(self):
+        t1 = {'spec': {'a': 1, 'b': 1}, 'status': 1}
+        t2 = {'spec': {'a': 2, 'b': 2}, 'status': 2}
+        ddiff = DeepDiff(t1, t2, include_paths="root['spec']", exclude_paths="root['spec']['b']")
+        result = {'values_changed': {"root['spec']['a']": {'new_value': 2, 'old_value': 1}}}
+        assert result == ddiff
+
+    def test_skip_path_with_wildcard(self):
+        t1 = {'a': [{'b': 1, 'c': 1}, {'b': 2, 'c': 2}], 'd': {'x': {'b': 3}}}
+        t2 = {'a': [{'b': 10, 'c': 1}, {'b': 20, 'c': 3}], 'd': {'x': {'b': 30}}}
+        ddiff = DeepDiff(t1, t2, exclude_paths=["root['a'][*]['b']", "root[*]['x']"])
+        result = {'values_changed': {"root['a'][1]['c']": {'new_value': 3, 'old_value': 2}}}
+        assert result == ddiff
+
+    def test_skip_path_of_key_with_brackets(self):
+        t1 = {"['x']": 1, (1, 'a'): 1, 1: {'a': 1}}
+        t2 = {"['x']": 2, (1, 'a'): 2, 1: {'a': 2}}
+        ddiff = DeepDiff(t1, t2, exclude_paths=["root['['x']']", "root[1]['a']"])
+        assert {} == ddiff
+        ddiff = DeepDiff(t1, t2, exclude_paths=["root[1]"])
+        result = {'values_changed': {
+            "root['['x']']": {'new_value': 2, 'old_value': 1}, "root[1]['a']": {'new_value': 2, 'old_value': 1}}}
+        assert result == ddiff
+
     # TODO: fix it for python 3.5, 3.6 and pypy3
     def test_skip_regexp(self):
         t1 = [{'a': 1, 'b': 2}, {'c': 4, 'b': 5}]
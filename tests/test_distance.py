@@ -1,13 +1,19 @@
 import pytest
 import datetime
+import itertools
 from decimal import Decimal
 from deepdiff import DeepDiff
 from deepdiff.helper import np
-from deepdiff.diff import DELTA_VIEW, CUTOFF_RANGE_ERROR_MSG
+from deepdiff.diff import (
+    DELTA_VIEW, CUTOFF_RANGE_ERROR_MSG, LSH_BANDS_FOR_PAIRS_MSG, MAX_CANDIDATES_FOR_PAIRS_MSG,
+    MEMORY_BUDGET_FOR_PAIRS_MSG)
 from deepdiff.deephash import sha256hex
 from deepdiff.distance import (
     _get_item_length, _get_numbers_distance, get_numeric_types_distance,
-    _get_numpy_array_distance, DISTANCE_CALCS_NEEDS_CACHE)
+    _get_numpy_array_distance, _get_leaf_features, _get_min_cost_assignment, DISTANCE_CALCS_NEEDS_CACHE,
+    DiffLengthLimitReached)
+from deepdiff.deephash import DeepHash
+from deepdiff.model import DiffLevel
 from tests import CustomClass
 
 
@@ -229,3 +235,211 @@ class TestDeepDistance:
         with pytest.raises(ValueError) as excinfo:
             DeepDiff(1, 2, cutoff_distance_for_pairs=2)
         assert CUTOFF_RANGE_ERROR_MSG == str(excinfo.value)
+
+    @pytest.mark.parametrize('lsh_bands_for_pairs', [-1, 1.5, True])
+    def test_lsh_bands_for_pairs_range(self, lsh_bands_for_pairs):
+        with pytest.raises(ValueError) as excinfo:
+            DeepDiff(1, 2, lsh_bands_for_pairs=lsh_bands_for_pairs)
+        assert LSH_BANDS_FOR_PAIRS_MSG == str(excinfo.value)
+
+    def test_get_leaf_features(self):
+        item1 = {'a': [1, 2], 'b': {'c': 'd'}}
+        item2 = {'a': [2, 1], 'b': {'c': 'e'}}
+        hashes = DeepHash([item1, item2]).hashes
+        features1 = _get_leaf_features(item1, hashes)
+        features2 = _get_leaf_features(item2, hashes)
+        assert 3 == len(features1)
+        assert 2 == len(features1 & features2)
+        assert _get_leaf_features('abc', hashes) is None
+        assert _get_leaf_features(1, hashes) is None
+
+    @pytest.mark.skipif(np is None, reason="Numpy is needed for lsh_bands_for_pairs")
+    def test_lsh_bands_for_pairs(self):
+        t1 = [{'id': i, 'name': 'name{}'.format(i), 'city': 'city{}'.format(i % 3), 'age': i,
+               'tags': ['tag{}'.format(i)]} for i in range(30)]
+        t2 = [dict(item, age=item['age'] + 100) for item in reversed(t1)]
+        diff = DeepDiff(t1, t2, ignore_order=True, cutoff_intersection_for_pairs=1)
+        lsh_diff = DeepDiff(t1, t2, ignore_order=True, cutoff_intersection_for_pairs=1, lsh_bands_for_pairs=32)
+        assert 30 == len(diff['values_changed'])
+        assert diff == lsh_diff
+        assert diff.get_stats()['DIFF COUNT'] > 4 * lsh_diff.get_stats()['DIFF COUNT']
+
+    @pytest.mark.skipif(np is None, reason="Numpy is needed for lsh_bands_for_pairs")
+    def test_lsh_candidates_keep_the_less_similar_items(self):
+        t1 = [{'a': 1, 'b': 2, 'c': 3, 'd': 4}, {'a': 1, 'b': 2, 'c': 30, 'd': 40}]
+        t2 = [{'a': 1, 'b': 2, 'c': 3, 'd': 5}, {'x': 1, 'y': 2}]
+        diff = DeepDiff(t1, t2, ignore_order=True, lsh_bands_for_pairs=64, cache_purge_level=0)
+        level = DiffLevel(t1, t2)
+        t1_hashtable = diff._create_hashtable(level, 't1')
+        t2_hashtable = diff._create_hashtable(level, 't2')
+        hashes_added = list(t2_hashtable)
+        hashes_removed = list(t1_hashtable)
+        candidates = diff._get_lsh_candidates(hashes_added, hashes_removed, t1_hashtable, t2_hashtable)
+        # The second removed item has only 2 of its 4 leaves in common but it is in the same bucket of a band.
+        assert [hashes_added[0]] == list(candidates)
+        assert set(hashes_removed) == set(candidates[hashes_added[0]])
+
+    @pytest.mark.parametrize('t1, t2, ignore_order', [
+        ([1, 2, 3], [1, 2, 4], False),
+        ([1, 2, 3], [1], False),
+        ([[1, 2]], [[3]], False),
+        ([[]], [3, 3], True),
+        ([1, {}], [1], True),
+        ({'a': [1, 2], 'b': None}, {'b': 'x', 'c': {'d': 1}}, False),
+        ({1, 2, (3, 4)}, {1, 5}, False),
+        ([[1, 2], 'a'], [[2, 3, 3], 'a', 'b'], True),
+        ({'a': 1, 'b': str}, {'a': '1', 'b': [1, 2]}, False),
+        ([1, 1, 2, [3]], [1, 2, 2, 2, [4]], True),
+        ({'a': True, 'b': [False]}, {'a': False, 'b': [True]}, False),
+    ])
+    def test_diff_length_is_the_length_of_the_delta(self, t1, t2, ignore_order):
+        for report_repetition in (False, True):
+            diff = DeepDiff(t1, t2, ignore_order=ignore_order, report_repetition=report_repetition, view=DELTA_VIEW)
+            counted_diff = DeepDiff(
+                t1, t2, ignore_order=ignore_order, report_repetition=report_repetition,
+                view=DELTA_VIEW, _max_diff_length=1000)
+            assert _get_item_length(diff) == counted_diff._diff_length
+            # The results are not built when only the length of the diff is needed.
+            assert {} == counted_diff
+
+    def test_max_diff_length(self):
+        t1 = {'a': 1, 'b': 2, 'c': 3}
+        t2 = {'a': 10, 'b': 20, 'c': 3}
+        diff = DeepDiff(t1, t2, view=DELTA_VIEW, _max_diff_length=3)
+        assert 2 == diff._diff_length
+        with pytest.raises(DiffLengthLimitReached):
+            DeepDiff(t1, t2, view=DELTA_VIEW, _max_diff_length=2)
+
+    def test_pairs_that_are_too_far_stop_early(self):
+        t1 = [['{}-{}'.format(i, j) for j in range(6)] for i in range(6)]
+        t2 = [['changed'] + item[1:] for item in reversed(t1)]
+        diff = DeepDiff(t1, t2, ignore_order=True, cutoff_intersection_for_pairs=1)
+        assert {'changed'} == {change['new_value'] for change in diff['values_changed'].values()}
+        assert 6 == len(diff['values_changed'])
+
+    @pytest.mark.parametrize('parameters, expected_msg', [
+        ({'max_candidates_for_pairs': 0}, MAX_CANDIDATES_FOR_PAIRS_MSG),
+        ({'max_candidates_for_pairs': 1.5}, MAX_CANDIDATES_FOR_PAIRS_MSG),
+        ({'memory_budget_for_pairs': 0}, MEMORY_BUDGET_FOR_PAIRS_MSG),
+        ({'memory_budget_for_pairs': None}, MEMORY_BUDGET_FOR_PAIRS_MSG),
+    ])
+    def test_parameters_for_pairs_range(self, parameters, expected_msg):
+        with pytest.raises(ValueError) as excinfo:
+            DeepDiff([1], [2], ignore_order=True, **parameters)
+        assert expected_msg == str(excinfo.value)
+
+    @pytest.mark.skipif(np is None, reason="Numpy is needed to precalculate the distances")
+    @pytest.mark.parametrize('t1, t2', [
+        ([1, 10, 100, 1000, 7], [1.1, 11, 110, 1100, 7]),
+        ([1.5, 2.5, 3.5, 40.5, 50.5], [41.5, 51.5, 1.6, 2.6, 3.6]),
+        (np.array([1, 20, 30, 40, 50]) if np else None, np.array([41, 51, 2, 21, 31]) if np else None),
+    ])
+    def test_numbers_distances_are_calculated_in_blocks(self, t1, t2):
+        diff = DeepDiff(t1, t2, ignore_order=True, cutoff_intersection_for_pairs=1)
+        assert diff
+        assert diff == DeepDiff(t1, t2, ignore_order=True, cutoff_intersection_for_pairs=1, memory_budget_for_pairs=1)
+        assert diff == DeepDiff(t1, t2, ignore_order=True, cutoff_intersection_for_pairs=1, max_candidates_for_pairs=2)
+
+    @pytest.mark.skipif(np is None, reason="Numpy is needed to precalculate the distances")
+    def test_max_candidates_for_pairs_of_numbers(self):
+        t1 = [10, 20, 30]
+        t2 = [31, 32, 33]
+        diff = DeepDiff(t1, t2, ignore_order=True, cutoff_intersection_for_pairs=1, cache_purge_level=0)
+        level = DiffLevel(t1, t2)
+        t1_hashtable = diff._create_hashtable(level, 't1')
+        t2_hashtable = diff._create_hashtable(level, 't2')
+        hashes_added = list(t2_hashtable)
+        hashes_removed = list(t1_hashtable)
+        diff.max_candidates_for_pairs = 1
+        distances = diff._precalculate_numpy_arrays_distance(
+            hashes_added, hashes_removed, t1_hashtable, t2_hashtable, _original_type=None)
+        assert {hashes_added[0], hashes_added[1], hashes_added[2]} == set(distances)
+        # Only the closest removed number is kept for each added number.
+        assert [[hashes_removed[2]]] * 3 == [
+            [removed_hash for removed_hash, _ in distances[added_hash]] for added_hash in hashes_added]
+
+    def test_max_candidates_for_pairs(self):
+        t1 = [{'a': 1, 'b': 2, 'c': 3}, {'a': 4, 'b': 5, 'c': 6}, {'a': 7, 'b': 8, 'c': 9}]
+        t2 = [{'a': 7, 'b': 8, 'c': 0}, {'a': 1, 'b': 2, 'c': 0}, {'a': 4, 'b': 5, 'c': 0}]
+        diff = DeepDiff(t1, t2, ignore_order=True, cutoff_intersection_for_pairs=1)
+        assert 3 == len(diff['values_changed'])
+        assert diff == DeepDiff(t1, t2, ignore_order=True, cutoff_intersection_for_pairs=1, max_candidates_for_pairs=1)
+
+    @pytest.mark.skipif(np is None, reason="Numpy is needed for calculating the distances of records in columns")
+    def test_records_distances_are_calculated_in_columns(self):
+        t1 = [{'id': 1, 'name': 'a', 'score': 1.5, 'active': True, 'note': None, '__private': 1},
+              {'id': 2, 'name': 'b', 'score': 2.5, 'active': False, 'note': None, '__private': 2},
+              {'id': 3, 'name': 'c', 'score': float('nan'), 'active': True, 'note': None, '__private': 3}]
+        t2 = [{'id': 3, 'name': 'c', 'score': 3.5, 'active': True, 'note': None, '__private': 4},
+              {'id': 1, 'name': 'a', 'score': 1.5, 'active': False, 'note': None, '__private': 5},
+              {'id': 2, 'name': 'bb', 'score': 2.5, 'active': True, 'note': None, '__private': 6}]
+        diff = DeepDiff(t1, t2, ignore_order=True, cutoff_intersection_for_pairs=1, cache_purge_level=0)
+        level = DiffLevel(t1, t2)
+        t1_hashtable = diff._create_hashtable(level, 't1')
+        t2_hashtable = diff._create_hashtable(level, 't2')
+        hashes_added = list(t2_hashtable)
+        hashes_removed = list(t1_hashtable)
+        distances = diff._precalculate_records_distance(
+            hashes_added, hashes_removed, t1_hashtable, t2_hashtable, _original_type=None)
+        assert 3 == len(distances)
+        for added_hash in hashes_added:
+            for removed_hash, distance in distances[added_hash]:
+                assert DeepDiff(
+                    t1_hashtable[removed_hash].item, t2_hashtable[added_hash].item,
+                    ignore_order=True, get_deep_distance=True)['deep_distance'] == distance
+
+        # The diff that compares the records one pair at a time gets the same result.
+        expected = DeepDiff(t1, t2, ignore_order=True, cutoff_intersection_for_pairs=1, exclude_types=[set])
+        diff = DeepDiff(t1, t2, ignore_order=True, cutoff_intersection_for_pairs=1)
+        assert 4 == len(diff['values_changed'])
+        assert expected == diff
+        assert expected.get_stats()['DIFF COUNT'] > diff.get_stats()['DIFF COUNT']
+
+    @pytest.mark.parametrize('t1, t2', [
+        ([{'a': 1}, {'a': 2}], [{'a': 3}, {'b': 4}]),
+        ([{'a': 1}, {'a': 2}], [{'a': 3}, {'a': 4.0}]),
+        ([{'a': 1}, {'a': 2}], [{'a': 3}, {'a': [4]}]),
+        ([{'a': 1}, (('a', 2),)], [{'a': 3}, {'a': 4}]),
+    ])
+    def test_records_distances_need_the_same_keys_and_types(self, t1, t2):
+        diff = DeepDiff(t1, t2, ignore_order=True, cache_purge_level=0)
+        level = DiffLevel(t1, t2)
+        t1_hashtable = diff._create_hashtable(level, 't1')
+        t2_hashtable = diff._create_hashtable(level, 't2')
+        assert diff._precalculate_records_distance(
+            list(t2_hashtable), list(t1_hashtable), t1_hashtable, t2_hashtable, _original_type=None) is None
+
+    @pytest.mark.skipif(np is None, reason="Numpy is needed for optimal_pairs")
+    @pytest.mark.parametrize('rows, columns', [(1, 1), (3, 3), (3, 5), (6, 6)])
+    def test_min_cost_assignment(self, rows, columns):
+        costs = np.random.default_rng(rows * columns).random((rows, columns)).round(1)
+        assignment = _get_min_cost_assignment(costs)
+        assert rows == len(set(assignment.tolist()))
+        expected = min(
+            sum(costs[row, column] for row, column in enumerate(permutation))
+            for permutation in itertools.permutations(range(columns), rows))
+        assert expected == pytest.approx(costs[np.arange(rows), assignment].sum())
+
+    @pytest.mark.skipif(np is None, reason="Numpy is needed for optimal_pairs")
+    def test_optimal_pairs(self):
+        t1 = [128, 98, 63]
+        t2 = [73, 79, 112]
+        diff = DeepDiff(t1, t2, ignore_order=True, cutoff_intersection_for_pairs=1)
+        # The closest pairs are taken first and 128 and 79 are left without a pair.
+        assert {'root[0]': 128} == diff['iterable_item_removed']
+        diff = DeepDiff(t1, t2, ignore_order=True, cutoff_intersection_for_pairs=1, optimal_pairs=True)
+        expected = {
+            'values_changed': {
+                'root[2]': {'new_value': 73, 'old_value': 63},
+                'root[1]': {'new_value': 79, 'old_value': 98},
+                'root[0]': {'new_value': 112, 'old_value': 128}
+            }
+        }
+        assert expected == diff
+
+    @pytest.mark.skipif(np is None, reason="Numpy is needed for optimal_pairs")
+    def test_optimal_pairs_of_groups(self):
+        t1 = [{'a': 1, 'b': [1, 2]}, {'a': 2, 'b': [1, 2]}, {'c': 'x', 'd': [3]}]
+        t2 = [{'c': 'y', 'd': [3]}, {'a': 1, 'b': [1, 3]}, {'a': 3, 'b': [1, 2]}, {'e': [4, 5, 6]}]
+        diff = DeepDiff(t1, t2, ignore_order=True, cutoff_intersection_for_pairs=1)
+        assert diff == DeepDiff(t1, t2, ignore_order=True, cutoff_intersection_for_pairs=1, optimal_pairs=True)
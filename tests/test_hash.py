@@ -8,7 +8,8 @@ from functools import partial
 from enum import Enum
 from deepdiff import DeepHash
 from deepdiff.deephash import (
-    prepare_string_for_hashing, unprocessed, UNPROCESSED_KEY, BoolObj, HASH_LOOKUP_ERR_MSG, combine_hashes_lists)
+    prepare_string_for_hashing, unprocessed, UNPROCESSED_KEY, BoolObj, HASH_LOOKUP_ERR_MSG, combine_hashes_lists,
+    HashesByType)
 from deepdiff.helper import pypy3, get_id, number_to_string, np
 from tests import CustomClass2
 
@@ -151,6 +152,34 @@ class TestDeepHash:
         b_hash = DeepHash(b, ignore_string_type_changes=True, hasher=DeepHash.sha1hex)[b]
         assert a_hash == b_hash
 
+    @pytest.mark.parametrize("t1, t2, params, is_equal", [
+        (np.array([[1, 2], [3, 4]]), np.array([[4, 3], [2, 1]]), {}, True),
+        (np.array([[1, 2], [3, 4]]), np.array([[4, 3], [2, 1]]), {'ignore_iterable_order': False}, False),
+        (np.array([[1, 2], [3, 4]]), np.array([[1, 2], [3, 4]]), {'ignore_iterable_order': False}, True),
+        (np.array([[1, 2], [3, 4]]), np.array([[1, 3], [2, 4]]), {}, False),
+        (np.array([1, 1, 2]), np.array([2, 1, 2]), {}, True),
+        (np.array([1, 1, 2]), np.array([2, 1, 2]), {'ignore_repetition': False}, False),
+        (np.array([[1, 1], [2, 2]]), np.array([[1, 1], [1, 1]]), {}, False),
+        (np.array([0.1234, np.nan]), np.array([np.nan, 0.1231]), {'significant_digits': 3}, True),
+        (np.array([0.1234, np.nan]), np.array([np.nan, 0.1231]), {}, False),
+        (np.array([0.0, np.nan]), np.array([-0.0, np.nan]), {'ignore_iterable_order': False}, True),
+        (np.array([1.0], np.float64), np.array([1.0], np.float32), {}, False),
+        (np.array([True, False]), np.array([False, True]), {}, True),
+    ])
+    def test_numpy_array_hashed_from_buffer(self, t1, t2, params, is_equal):
+        t1_hash = DeepHash(t1, **params)
+        t2_hash = DeepHash(t2, **params)
+        assert (t1_hash[t1] == t2_hash[t2]) is is_equal
+        t1_list = t1.tolist()
+        assert t1_hash.get(t1, extract_index=1) == DeepHash(t1_list).get(t1_list, extract_index=1)
+
+    def test_numpy_array_hashed_item_by_item_when_items_are_excluded(self):
+        t1 = np.array([[1, 2], [3, 4]])
+        t2 = np.array([[1, 2], [3, 5]])
+        t1_hash = DeepHash(t1, exclude_paths=['root[1][1]'])
+        t2_hash = DeepHash(t2, exclude_paths=['root[1][1]'])
+        assert t1_hash[t1] == t2_hash[t2]
+
 
 class TestDeepHashPrep:
     """DeepHashPrep Tests covering object serialization."""
@@ -501,6 +530,29 @@ class TestDeepHashPrep:
 
         assert hash_a[list1_id].replace('3|1', '3|2') == hash_b[list2_id]
 
+    def test_iterable_order_not_ignored(self):
+        a = [1, 2, [3, 4]]
+        b = [1, 2, [4, 3]]
+        assert DeepHashPrep(a)[a] == DeepHashPrep(b)[b]
+        assert 'list:int:1,int:2,list:int:3,int:4' == DeepHashPrep(a, ignore_iterable_order=False)[a]
+        assert DeepHashPrep(a, ignore_iterable_order=False)[a] != DeepHashPrep(b, ignore_iterable_order=False)[b]
+
+    def test_iterable_order_not_ignored_for_sets(self):
+        a = [{1, 2}, 1, 1]
+        result = DeepHashPrep(a, ignore_iterable_order=False)
+        assert 'list:set:int:1,int:2,int:1,int:1' == result[a]
+
+    def test_hashes_by_type(self):
+        hashes = HashesByType()
+        a = [1, (1, )]
+        b = [1.0, (1.0, )]
+        DeepHash(a, hashes=hashes)
+        DeepHash(b, hashes=hashes)
+        assert hashes[1] != hashes[1.0]
+        assert hashes[a[1]] != hashes[b[1]]
+        assert 1.0 in hashes
+        assert 2 not in hashes
+
     def test_already_calculated_hash_wont_be_recalculated(self):
         hashes = (i for i in range(10))
 
@@ -592,6 +644,32 @@ class TestDeepHashPrep:
         t2_hash = DeepHashPrep(t2, exclude_paths=exclude_paths)
         assert t1_hash[t1] == t2_hash[t2]
 
+    def test_include_paths(self):
+        t1 = [{'a': 1, 'e': 'Cool'}, {'a': 2, 'e': 'Hot'}]
+        t2 = [{'a': 1, 'e': 'Cold'}, {'a': 2, 'e': 'Warm'}]
+        t1_hash = DeepHashPrep(t1, include_paths=["root[*]['a']"])
+        t2_hash = DeepHashPrep(t2, include_paths=["root[*]['a']"])
+        assert t1_hash[t1] == t2_hash[t2]
+        assert 'Cool' not in t1_hash
+        t3 = [{'a': 3, 'e': 'Cool'}, {'a': 2, 'e': 'Hot'}]
+        t3_hash = DeepHashPrep(t3, include_paths=["root[*]['a']"])
+        assert t1_hash[t1] != t3_hash[t3]
+
+    def test_skip_path_with_wildcard(self):
+        t1 = [{'a': 1, 'e': 'Cool'}, {'a': 2, 'e': 'Hot'}]
+        t2 = [{'a': 1, 'e': 'Cold'}, {'a': 2, 'e': 'Warm'}]
+        t1_hash = DeepHashPrep(t1, exclude_paths=["root[*]['e']"])
+        t2_hash = DeepHashPrep(t2, exclude_paths=["root[*]['e']"])
+        assert t1_hash[t1] == t2_hash[t2]
+        assert 'Cool' not in t1_hash
+
+    def test_skip_path_of_key_with_brackets(self):
+        t1 = {"['x']": 'Cool', 'a': 1}
+        t2 = {"['x']": 'Hot', 'a': 1}
+        t1_hash = DeepHashPrep(t1, exclude_paths=["root['['x']']"])
+        t2_hash = DeepHashPrep(t2, exclude_paths=["root['['x']']"])
+        assert t1_hash[t1] == t2_hash[t2]
+
     def test_skip_regex_path(self):
         dic1 = {1: "a"}
         t1 = [dic1, 2]
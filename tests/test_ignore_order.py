@@ -3,8 +3,10 @@ import re
 from unittest import mock
 from deepdiff.helper import number_to_string, CannotCompare
 from deepdiff import DeepDiff
+from deepdiff.diff import INVALID_PARTITION_KEY_FUNC_MSG
 from decimal import Decimal
-from deepdiff.deephash import sha256hex
+from deepdiff.deephash import DeepHash, sha256hex
+from deepdiff.model import DiffLevel
 from tests import CustomClass2
 
 
@@ -530,6 +532,15 @@ class TestIgnoreOrder:
         result = {}
         assert result == ddiff
 
+    def test_include_paths(self):
+        t1 = [{'name': 'a', 'image': 'x:1', 'ts': 1}, {'name': 'b', 'image': 'y:1', 'ts': 2}]
+        t2 = [{'name': 'b', 'image': 'y:1', 'ts': 3}, {'name': 'a', 'image': 'x:2', 'ts': 4}]
+        ddiff = DeepDiff(t1, t2, include_paths="root[*]['name']", ignore_order=True)
+        assert {} == ddiff
+        ddiff = DeepDiff(t1, t2, include_paths=["root[*]['name']", "root[*]['image']"], ignore_order=True)
+        result = {'values_changed': {"root[0]['image']": {'new_value': 'x:2', 'old_value': 'x:1'}}}
+        assert result == ddiff
+
     def test_skip_str_type_in_dict_on_list_when_ignored_order(self):
         t1 = [{1: "a"}]
         t2 = [{}]
@@ -643,7 +654,7 @@ class TestIgnoreOrder:
         diff = DeepDiff(t1, t2, ignore_order=True, cache_size=5000, cutoff_intersection_for_pairs=1)
         expected = {
             'PASSES COUNT': 7,
-            'DIFF COUNT': 37,
+            'DIFF COUNT': 35,
             'DISTANCE CACHE HIT COUNT': 0,
             'MAX PASS LIMIT REACHED': False,
             'MAX DIFF LIMIT REACHED': False,
@@ -781,6 +792,81 @@ class TestIgnoreOrder:
         expected2 = {'iterable_item_added': {"root['BB']['ate'][1]": 'Brownies'}}
         assert expected2 == diff2
 
+    @pytest.mark.parametrize("t1, t2", [
+        ([1, 2, 2, 'a', None], [2, 'a', 'a', 3, None]),
+        ([1, True, 0, False], [1.0, 1, False, -0.0]),
+        ([float('nan'), 1.5, 'nan'], [float('nan'), 2.5, 'nan']),
+        ([1, 'NONE', 'int:2'], [None, 2, 'int:1']),
+        ((1, 2, 'b'), [2, 3, 'c']),
+        ([[1, 2], [3, 4, 4]], [[4, 3, 3], [2, 1]]),
+    ])
+    @pytest.mark.parametrize("report_repetition", [False, True])
+    def test_primitives_hashed_by_value(self, t1, t2, report_repetition):
+        diff = DeepDiff(t1, t2, ignore_order=True, report_repetition=report_repetition, cutoff_intersection_for_pairs=1)
+        # Excluding a type that is not there makes DeepHash hash every item.
+        expected = DeepDiff(t1, t2, ignore_order=True, report_repetition=report_repetition,
+                            cutoff_intersection_for_pairs=1, exclude_types=[set])
+        assert expected == diff
+
+    def test_create_hashtables_by_value(self):
+        t1 = [1, 'a', 2, 2]
+        t2 = [2, 'a', 3]
+        diff = DeepDiff(t1, t2, ignore_order=True, cache_purge_level=0)
+        t1_hashtable, t2_hashtable = diff._create_hashtables_by_value(DiffLevel(t1, t2))
+        # Only the items that are not in both lists are hashed.
+        assert [DeepHash(1)[1], ('a', ), 2] == list(t1_hashtable)
+        assert [2, ('a', ), DeepHash(3)[3]] == list(t2_hashtable)
+        assert [2, 3] == t1_hashtable[2].indexes
+        assert diff._create_hashtables_by_value(DiffLevel([1, 'int:1'], [1])) is None
+        assert diff._create_hashtables_by_value(DiffLevel([1, b'a'], [1])) is None
+
+    def test_partition_key_func(self):
+        t1 = [{'kind': 'a', 'values': [1, 2, 3, 4]}, {'kind': 'b', 'values': [5, 6, 7, 8]}]
+        t2 = [{'kind': 'b', 'values': [1, 2, 3, 4]}, {'kind': 'a', 'values': [5, 6, 7, 8, 9]}]
+        diff = DeepDiff(t1, t2, ignore_order=True, cutoff_intersection_for_pairs=1)
+        expected = {
+            'values_changed': {
+                "root[0]['kind']": {'new_value': 'b', 'old_value': 'a'},
+                "root[1]['kind']": {'new_value': 'a', 'old_value': 'b'}
+            },
+            'iterable_item_added': {"root[1]['values'][4]": 9}
+        }
+        assert expected == diff
+
+        def partition_key_func(item, level):
+            if not isinstance(item, dict):
+                raise CannotCompare() from None
+            return item['kind']
+
+        # The items are only paired with the items of the same kind.
+        diff2 = DeepDiff(t1, t2, ignore_order=True, cutoff_intersection_for_pairs=1,
+                         partition_key_func=partition_key_func)
+        assert {"root[0]['values'][4]": 9} == diff2['iterable_item_added']
+        assert 8 == len(diff2['values_changed'])
+        assert all("['values']" in path for path in diff2['values_changed'])
+
+    @pytest.mark.parametrize("ignore_numeric_type_changes, expected", [
+        (False, {
+            'values_changed': {'root[2]': {'new_value': 1.5, 'old_value': 2.5},
+                               'root[1]': {'new_value': 'b', 'old_value': 'a'}},
+            'iterable_item_removed': {'root[0]': 1}
+        }),
+        (True, {
+            'values_changed': {'root[0]': {'new_value': 1.5, 'old_value': 1},
+                               'root[1]': {'new_value': 'b', 'old_value': 'a'}},
+            'iterable_item_removed': {'root[2]': 2.5}
+        }),
+    ])
+    def test_partition_key_func_by_type(self, ignore_numeric_type_changes, expected):
+        diff = DeepDiff([1, 'a', 2.5], [1.5, 'b'], ignore_order=True, cutoff_intersection_for_pairs=1,
+                        partition_key_func='type', ignore_numeric_type_changes=ignore_numeric_type_changes)
+        assert expected == diff
+
+    def test_partition_key_func_is_validated(self):
+        with pytest.raises(ValueError) as excinfo:
+            DeepDiff([1], [2], ignore_order=True, partition_key_func='kind')
+        assert str(excinfo.value) == INVALID_PARTITION_KEY_FUNC_MSG.format('kind')
+
 
 class TestCompareFuncIgnoreOrder:
 
@@ -170,6 +170,45 @@ class TestDiffLevel:
         assert path == 'root'
         assert down.path(output_format='list') == []
 
+    def test_path_is_built_on_top_of_the_path_of_up(self):
+        t1 = {1: {2: [3]}}
+        t2 = {1: {2: [4]}}
+        root = DiffLevel(t1, t2)
+        level1 = root.branch_deeper(t1[1], t2[1], DictRelationship, 1)
+        level2 = level1.branch_deeper(t1[1][2], t2[1][2], DictRelationship, 2)
+        level3 = level2.branch_deeper(3, 4, SubscriptableIterableRelationship, 0)
+        assert 'root[1][2][0]' == level3.path()
+        assert level3.up._path and level3.up.up._path
+        assert 'root[1][2]' == level3.up.path()
+        assert ('root[1][2]', 0, 'root[1][2][0]') == level3.path(get_parent_too=True)
+        assert [1, 2, 0] == level3.path(output_format='list')
+        assert [1, 2] == level3.up.path(output_format='list')
+
+    def test_branches_share_the_levels_above_until_materialized(self):
+        t1 = {1: [3, 5]}
+        t2 = {1: [4, 6]}
+        root = DiffLevel(t1, t2)
+        level1 = root.branch_deeper(t1[1], t2[1], DictRelationship, 1)
+        branch1 = level1.branch_deeper(3, 4, SubscriptableIterableRelationship, 0)
+        branch2 = level1.branch_deeper(5, 6, SubscriptableIterableRelationship, 1)
+        assert branch1.up is branch2.up is level1
+        assert root.down is None and level1.down is None
+        assert 'root[1][1]' == branch2.path()
+
+        branch1.materialize_chain()
+        branch2.materialize_chain()
+        assert branch1.up is not branch2.up
+        assert branch1.up.down is branch1 and branch2.up.down is branch2
+        assert branch1.all_up.all_down is branch1
+        assert branch2.all_up.all_down is branch2
+        assert branch1.all_up.up is None
+        assert 0 == branch1.up.t1_child_rel.param
+        assert 1 == branch2.up.t2_child_rel.param
+        assert branch2.up.t2_child_rel.parent is t2[1]
+        assert 'root[1][0]' == branch1.path()
+        assert 'root[1][1]' == branch2.path()
+        assert level1.down is None
+
     def test_repr_short(self):
         level = self.lowest.verbose_level
         try:
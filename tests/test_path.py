@@ -1,5 +1,5 @@
 import pytest
-from deepdiff.path import _path_to_elements, GET, GETATTR, extract
+from deepdiff.path import _path_to_elements, GET, GETATTR, extract, PathFilter, _split_path
 
 
 @pytest.mark.parametrize('path, expected', [
@@ -32,3 +32,49 @@ def test_path_to_elements(path, expected):
 def test_get_item(obj, path, expected):
     result = extract(obj, path)
     assert expected == result
+
+
+@pytest.mark.parametrize('path, expected', [
+    ("root['a'][1.5].b", ['root', "['a']", '[1.5]', '.b']),
+    ("root['a.b']['c[d]']", ['root', "['a.b']", "['c[d]']"]),
+    ("root[(1, 'x')]", ['root', "[(1, 'x')]"]),
+    ("root", ['root']),
+])
+def test_split_path(path, expected):
+    assert expected == _split_path(path)
+
+
+@pytest.mark.parametrize('paths, path, expected', [
+    (["root['a'][0]"], "root['a'][0]", True),
+    (["root['a'][0]"], "root['a'][1]", False),
+    (["root['a'][0]"], "root['a']", False),
+    (["root['a'][*]"], "root['a'][1]", True),
+    (["root['a'][*]"], "root['a']['b']", True),
+    (["root['a'][*]"], "root['a'].b", False),
+    (["root[*].b"], "root[1].b", True),
+    (["root['[*]']"], "root['x']", False),
+    (["root['[*]']"], "root['[*]']", True),
+    (["root['a'][*]", "root['a'][1].b"], "root['a'][1].b", True),
+    (["root['['x']']"], "root['['x']']", True),
+    (["root[1]['a']"], "root[1]['a']", True),
+])
+def test_path_filter(paths, path, expected):
+    path_filter = PathFilter(paths)
+    assert expected is path_filter.is_match(path_filter.get_state(path))
+
+
+def test_path_filter_advance():
+    path_filter = PathFilter(["root['a'][*]['b']"])
+    state = path_filter.get_state('root')
+    assert path_filter.advance(state, "['c']") is None
+    state = path_filter.advance(path_filter.advance(state, "['a']"), '[0]')
+    assert not path_filter.is_match(state)
+    assert path_filter.is_match(path_filter.advance(state, "['b']"))
+
+
+def test_path_filter_advance_by_key_with_brackets():
+    path_filter = PathFilter(["root['['x']']", "root[1]"])
+    state = path_filter.get_state('root')
+    assert path_filter.is_match(path_filter.advance(state, "['['x']']"))
+    # The repr of the tuple key (1, 'a') is not inside root[1].
+    assert not path_filter.is_match(path_filter.advance(state, "[1]['a']"))
@@ -239,6 +239,18 @@ class TestDeepSearch:
         result = {}
         assert ds == result
 
+    def test_skip_path_with_wildcard(self):
+        obj = {1: {2: "somewhere"}, 3: [{2: "somewhere"}, {4: "somewhere"}]}
+        ds = DeepSearch(obj, item, exclude_paths=['root[*][2]'])
+        result = {'matched_values': {'root[3][0][2]', 'root[3][1][4]'}}
+        assert ds == result
+
+    def test_skip_path_of_key_with_brackets(self):
+        obj = {"['x']": "somewhere", (1, 'a'): "somewhere", 'b': "somewhere"}
+        ds = DeepSearch(obj, item, exclude_paths=["root['['x']']", "root[(1, 'a')]"])
+        result = {'matched_values': {"root['b']"}}
+        assert ds == result
+
     def test_skip_type_str(self):
         obj = "long string somewhere"
         result = {}